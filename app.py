@@ -1,6 +1,7 @@
 import streamlit as st
 
 from config import STYLES
+from services.reference_data import penyedia_referensi_salur
 from ui_pages.merge_page import render_merge_page
 from ui_pages.split_page import render_split_page
 from ui_pages.validasi_page import render_validasi_page
@@ -9,6 +10,7 @@ st.set_page_config(page_title="Dashboard Validasi Data Sentra Antasena", layout=
 
 
 def main():
+    penyedia_referensi_salur()
     st.markdown(STYLES, unsafe_allow_html=True)
 
     st.sidebar.title("Menu Utama")
@@ -78,6 +78,10 @@ div[data-testid="stAlert"] > div[role="alert"][data-baseweb="notification"][kind
 </div>
 """
 
+PROGRAM_REFERENSI = [
+    {"kode": "SALUR_2026", "status": "SUDAH SALUR 2026", "warna": "#6f42c1", "backend": None},
+]
+
 COLOR_MAP = {
     "UNIK": "#28a745",
     "GANDA": "#dc3545",
@@ -85,9 +89,15 @@ COLOR_MAP = {
     "TIDAK 16 DIGIT": "#fd7e14",
     "TERKONVERSI (000)": "#17a2b8",
     "KOSONG": "#6c757d",
-    "SUDAH SALUR 2026": "#6f42c1",
+    **{program["status"]: program["warna"] for program in PROGRAM_REFERENSI},
 }
 
+BATAS_KATEGORI_UMUR = [
+    (0, "ANAK"),
+    (18, "DEWASA"),
+    (60, "LANSIA"),
+]
+
 COLOR_MAP_KATEGORI = {
     "ANAK": "#4fc3f7",
     "DEWASA": "#66bb6a",
@@ -102,7 +112,7 @@ TEXT_COLUMNS_KEYWORDS = [
 ]
 
 SPLIT_HELP_TEXT = {
-    "upload": "Upload file Excel/CSV. File akan diproses di memory server dan tidak disimpan secara permanen.",
+    "upload": "Upload file Excel/CSV. File diproses di memory server. Hasil olahan disimpan sementara di server (maksimal 24 jam) agar proses ulang dengan file dan pengaturan yang sama lebih cepat, lalu dihapus otomatis.",
     "header_row": "Baris yang berisi nama kolom header. Default: 1 (baris pertama). Ubah jika header tidak di baris pertama.",
     "kolom_split": "Pilih kolom yang nilainya akan digunakan untuk memecah file. Setiap unique value di kolom ini akan menjadi 1 file output terpisah.",
     "kolom_split_bertingkat": "Pilih satu atau beberapa kolom. Urutan pilihan menjadi level split, misalnya Provinsi > Kabupaten > Kecamatan.",
@@ -0,0 +1,227 @@
+import os
+import posixpath
+import re
+import sys
+import time
+import zipfile
+from datetime import date, datetime
+from xml.etree import ElementTree
+
+import numpy as np
+import pandas as pd
+
+
+EXCEL_ENGINE = os.environ.get("EXCEL_ENGINE", "auto")
+KODE_ERROR_EXCEL = frozenset(("#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#N/A"))
+NILAI_NA_BAWAAN = frozenset(
+    (
+        "-1.#IND", "1.#QNAN", "1.#IND", "-1.#QNAN", "#N/A N/A", "#N/A", "N/A", "n/a", "NA", "<NA>",
+        "#NA", "NULL", "null", "NaN", "-NaN", "nan", "-nan", "None", "",
+    )
+)
+_NILAI_KOSONG = NILAI_NA_BAWAAN | KODE_ERROR_EXCEL
+BYTES_KEPALA_SHEET = 64 * 1024
+_POLA_DIMENSI = re.compile(rb'<(?:\w+:)?dimension\s+ref="([A-Z]*)(\d*)(?::([A-Z]+)(\d+))?"')
+_POLA_SHEET_DATA = re.compile(rb"<(?:\w+:)?sheetData[\s>/]")
+
+
+def _ke_teks(value):
+    if value is None:
+        return np.nan
+    tipe = type(value)
+    if tipe is str:
+        return np.nan if value in _NILAI_KOSONG else value
+    if tipe is float:
+        if value != value:
+            return np.nan
+        return str(int(value)) if value.is_integer() else str(value)
+    if tipe is date:
+        return str(datetime(value.year, value.month, value.day))
+    return str(value)
+
+
+_ke_teks_grid = np.frompyfunc(_ke_teks, 1, 1)
+
+
+def _bingkai_dari_baris(rows):
+    rows = list(rows)
+    lebar = max(map(len, rows), default=0)
+    grid = np.full((len(rows), lebar), None, dtype=object)
+    for nomor, row in enumerate(rows):
+        grid[nomor, :len(row)] = row
+
+    terisi = ~(pd.isna(grid) | (grid == ""))
+    baris_terisi = np.flatnonzero(terisi.any(axis=1))
+    if not len(baris_terisi):
+        return pd.DataFrame()
+    kolom_terisi = np.flatnonzero(terisi.any(axis=0))
+    grid = grid[:baris_terisi[-1] + 1, :kolom_terisi[-1] + 1]
+    return pd.DataFrame(_ke_teks_grid(grid).astype(object))
+
+
+def _baca_calamine(uploaded_file, selected_sheet):
+    from python_calamine import CalamineWorkbook
+
+    uploaded_file.seek(0)
+    workbook = CalamineWorkbook.from_filelike(uploaded_file)
+    return _bingkai_dari_baris(workbook.get_sheet_by_name(selected_sheet).to_python(skip_empty_area=False))
+
+
+def _baca_openpyxl_stream(uploaded_file, selected_sheet):
+    from openpyxl import load_workbook
+
+    uploaded_file.seek(0)
+    workbook = load_workbook(uploaded_file, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook[selected_sheet]
+        sheet.reset_dimensions()
+        return _bingkai_dari_baris(sheet.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def _baca_pandas(uploaded_file, selected_sheet):
+    uploaded_file.seek(0)
+    return pd.read_excel(uploaded_file, sheet_name=selected_sheet, header=None, dtype=str)
+
+
+def _nama_tag(element):
+    return element.tag.rsplit("}", 1)[-1]
+
+
+def _atribut(element, nama):
+    for kunci, value in element.attrib.items():
+        if kunci.rsplit("}", 1)[-1] == nama:
+            return value
+    return None
+
+
+def _nomor_kolom(huruf):
+    nomor = 0
+    for karakter in huruf:
+        nomor = nomor * 26 + ord(karakter) - ord("A") + 1
+    return nomor
+
+
+def _dimensi_sheet(arsip, path):
+    kepala = b""
+    with arsip.open(path) as f:
+        while len(kepala) < BYTES_KEPALA_SHEET:
+            potongan = f.read(4096)
+            if not potongan:
+                break
+            kepala += potongan
+            cocok = _POLA_DIMENSI.search(kepala)
+            if cocok or _POLA_SHEET_DATA.search(kepala):
+                break
+    cocok = _POLA_DIMENSI.search(kepala)
+    if not cocok or not cocok.group(2):
+        return {"dimensi": None, "jumlah_baris": None, "jumlah_kolom": None}
+
+    kolom_awal, baris_awal, kolom_akhir, baris_akhir = (
+        bagian.decode("ascii") if bagian else None for bagian in cocok.groups()
+    )
+    kolom_akhir, baris_akhir = kolom_akhir or kolom_awal, baris_akhir or baris_awal
+    return {
+        "dimensi": f"{kolom_awal}{baris_awal}:{kolom_akhir}{baris_akhir}",
+        "jumlah_baris": int(baris_akhir) - int(baris_awal) + 1,
+        "jumlah_kolom": _nomor_kolom(kolom_akhir) - _nomor_kolom(kolom_awal) + 1,
+    }
+
+
+def _info_sheet_xlsx(uploaded_file):
+    uploaded_file.seek(0)
+    with zipfile.ZipFile(uploaded_file) as arsip:
+        workbook = ElementTree.fromstring(arsip.read("xl/workbook.xml"))
+        relasi = ElementTree.fromstring(arsip.read("xl/_rels/workbook.xml.rels"))
+        target = {
+            rel.get("Id"): rel.get("Target")
+            for rel in relasi
+            if (rel.get("Type") or "").endswith("/worksheet")
+        }
+
+        info = []
+        for sheet in workbook.iter():
+            if _nama_tag(sheet) != "sheet" or _atribut(sheet, "id") not in target:
+                continue
+            path = target[_atribut(sheet, "id")]
+            path = path.lstrip("/") if path.startswith("/") else posixpath.normpath(posixpath.join("xl", path))
+            info.append({"nama": sheet.get("name"), **_dimensi_sheet(arsip, path)})
+    uploaded_file.seek(0)
+    return info
+
+
+def baca_info_sheet(uploaded_file):
+    try:
+        return _info_sheet_xlsx(uploaded_file)
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+        uploaded_file.seek(0)
+        return [
+            {"nama": nama, "dimensi": None, "jumlah_baris": None, "jumlah_kolom": None}
+            for nama in pd.ExcelFile(uploaded_file).sheet_names
+        ]
+
+
+MESIN_EXCEL = {
+    "calamine": _baca_calamine,
+    "openpyxl_stream": _baca_openpyxl_stream,
+    "pandas": _baca_pandas,
+}
+
+
+def _urutan_mesin(mesin=None):
+    mesin = mesin or EXCEL_ENGINE
+    if mesin == "auto":
+        return list(MESIN_EXCEL)
+    if mesin not in MESIN_EXCEL:
+        raise ValueError(f"Engine Excel tidak dikenal: {mesin}")
+    return [mesin] if mesin == "pandas" else [mesin, "pandas"]
+
+
+def baca_excel_mentah(uploaded_file, selected_sheet, mesin=None):
+    *mesin_cepat, mesin_cadangan = _urutan_mesin(mesin)
+    for nama in mesin_cepat:
+        try:
+            return MESIN_EXCEL[nama](uploaded_file, selected_sheet)
+        except Exception:
+            continue
+    return MESIN_EXCEL[mesin_cadangan](uploaded_file, selected_sheet)
+
+
+def benchmark_mesin(uploaded_file, selected_sheet, daftar_mesin=None, ulang=3):
+    hasil = []
+    for nama in daftar_mesin or list(MESIN_EXCEL):
+        durasi = []
+        try:
+            for _ in range(ulang):
+                mulai = time.perf_counter()
+                df = MESIN_EXCEL[nama](uploaded_file, selected_sheet)
+                durasi.append(time.perf_counter() - mulai)
+        except Exception as e:
+            hasil.append({"mesin": nama, "baris": 0, "detik": None, "baris_per_detik": None, "galat": str(e)})
+            continue
+        detik = min(durasi)
+        hasil.append(
+            {
+                "mesin": nama,
+                "baris": len(df),
+                "detik": round(detik, 4),
+                "baris_per_detik": round(len(df) / detik) if detik else None,
+                "galat": None,
+            }
+        )
+    return hasil
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("Pemakaian: python -m services.excel_engines <file.xlsx> [sheet] [ulang]")
+    path = sys.argv[1]
+    with open(path, "rb") as f:
+        sheet = sys.argv[2] if len(sys.argv) > 2 else baca_info_sheet(f)[0]["nama"]
+        ulang = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+        for baris in benchmark_mesin(f, sheet, ulang=ulang):
+            if baris["galat"]:
+                print(f"{baris['mesin']:<16} gagal: {baris['galat']}")
+            else:
+                print(f"{baris['mesin']:<16} {baris['baris']:>10} baris  {baris['detik']:>8.3f} s  {baris['baris_per_detik']:>10} baris/detik")
@@ -84,14 +84,22 @@ def buat_merge_error_report_buffer(error_frames: dict[str, pd.DataFrame]):
 
 def buat_validation_error_report_buffer(error_frames: dict[str, pd.DataFrame]):
     buffer = io.BytesIO()
-    sheet_map = {
+    sheet_awal = {
         "REKAP_ERROR": error_frames.get("summary_df", pd.DataFrame()),
         "DUPLIKAT": error_frames.get("duplicate_df", pd.DataFrame()),
-        "SUDAH_SALUR": error_frames.get("salur_df", pd.DataFrame()),
+    }
+    sheet_akhir = {
         "KOSONG": error_frames.get("empty_df", pd.DataFrame()),
         "TIDAK_VALID": error_frames.get("invalid_df", pd.DataFrame()),
         "USIA_TIDAK_VALID": error_frames.get("usia_invalid_df", pd.DataFrame()),
     }
+    used_names = set(sheet_awal) | set(sheet_akhir)
+    sheet_program = {}
+    for status, df in error_frames.get("program_dfs", {}).items():
+        sheet_name = sanitize_excel_sheet_name(status.replace(" ", "_"), used_names)
+        used_names.add(sheet_name)
+        sheet_program[sheet_name] = df
+    sheet_map = {**sheet_awal, **sheet_program, **sheet_akhir}
 
     with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
         for sheet_name, df in sheet_map.items():
@@ -1,39 +1,225 @@
+import codecs
+import csv
+import io
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
+from services.excel_engines import baca_excel_mentah, baca_info_sheet
+from services.workbook_cache import muat_dengan_cache
 
-def baca_preview_mentah(uploaded_file, selected_sheet, is_csv):
+
+BARIS_KEPALA_MENTAH = 100
+BYTES_SNIFF_CSV = 64 * 1024
+PEMISAH_CSV = ",;\t|"
+TEKS_DTYPE = os.environ.get("TEKS_DTYPE", "object")
+KOLOM_PARALEL_MIN = 16
+_POLA_NOL_DESIMAL = re.compile(r"\.0$")
+_POLA_TANGGAL_WAKTU = re.compile(r"^(\d{4})-(\d{2})-(\d{2}) \d{2}:\d{2}:\d{2}$")
+
+
+def dtype_teks():
+    if TEKS_DTYPE != "pyarrow":
+        return object
+    try:
+        return pd.StringDtype("pyarrow")
+    except ImportError:
+        return object
+
+
+def baca_katalog_sheet(uploaded_file, is_csv):
     if is_csv:
+        return [{"nama": "Sheet1", "dimensi": None, "jumlah_baris": None, "jumlah_kolom": None}]
+    return muat_dengan_cache(uploaded_file, "katalog_sheet", (), lambda: baca_info_sheet(uploaded_file))
+
+
+def label_sheet(info):
+    if not info.get("dimensi"):
+        return info["nama"]
+    return f"{info['nama']} (±{info['jumlah_baris']:,} baris × {info['jumlah_kolom']} kolom)"
+
+
+def _encoding_sampel(sampel):
+    if sampel.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    potongan = sampel[:sampel.rfind(b"\n") + 1] or sampel
+    for encoding in ("utf-8", "cp1252"):
+        try:
+            potongan.decode(encoding)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+
+def _sniff_dialek_csv(uploaded_file):
+    uploaded_file.seek(0)
+    sampel = uploaded_file.read(BYTES_SNIFF_CSV)
+    uploaded_file.seek(0)
+    if isinstance(sampel, str):
+        sampel = sampel.encode("utf-8")
+
+    encoding = _encoding_sampel(sampel)
+    teks = sampel.decode(encoding, errors="ignore")
+    if len(sampel) == BYTES_SNIFF_CSV and "\n" in teks:
+        teks = teks[:teks.rfind("\n")]
+    try:
+        dialek = csv.Sniffer().sniff(teks, delimiters=PEMISAH_CSV)
+        return {
+            "sep": dialek.delimiter,
+            "quotechar": dialek.quotechar or '"',
+            "encoding": encoding,
+        }
+    except csv.Error:
+        baris_pertama = teks.split("\n", 1)[0]
+        return {
+            "sep": max(PEMISAH_CSV, key=baris_pertama.count) if baris_pertama else ",",
+            "quotechar": '"',
+            "encoding": encoding,
+        }
+
+
+def deteksi_dialek_csv(uploaded_file):
+    return muat_dengan_cache(uploaded_file, "dialek_csv", (), lambda: _sniff_dialek_csv(uploaded_file))
+
+
+def _baca_csv_mentah(uploaded_file):
+    dialek = deteksi_dialek_csv(uploaded_file)
+    for engine in ("pyarrow", "c"):
         uploaded_file.seek(0)
         try:
-            return pd.read_csv(uploaded_file, header=None, nrows=10)
-        except Exception:
-            uploaded_file.seek(0)
-            return pd.read_csv(uploaded_file, header=None, nrows=10, sep=";")
-    return pd.read_excel(
+            df = pd.read_csv(uploaded_file, header=None, dtype=str, engine=engine, **dialek)
+            return df.set_axis(range(df.shape[1]), axis=1)
+        except (ImportError, ValueError):
+            continue
+
+    uploaded_file.seek(0)
+    teks = io.TextIOWrapper(uploaded_file, encoding=dialek["encoding"], errors="ignore", newline="")
+    try:
+        pembaca = csv.reader(teks, delimiter=dialek["sep"], quotechar=dialek["quotechar"])
+        lebar = max((len(row) for row in pembaca), default=0)
+    finally:
+        teks.detach()
+    uploaded_file.seek(0)
+    return pd.read_csv(uploaded_file, header=None, dtype=str, names=range(lebar), **dialek)
+
+
+def _baca_grid_mentah(uploaded_file, selected_sheet, is_csv):
+    if is_csv:
+        return _baca_csv_mentah(uploaded_file)
+    return baca_excel_mentah(uploaded_file, selected_sheet)
+
+
+def _siapkan_grid(grid):
+    return {
+        "grid": normalisasi_teks(grid),
+        "kepala": grid.head(BARIS_KEPALA_MENTAH).copy(),
+        "kosong": grid.isna().all(axis=1).to_numpy(),
+    }
+
+
+def baca_grid(uploaded_file, selected_sheet, is_csv, pilih=None):
+    return muat_dengan_cache(
         uploaded_file,
-        sheet_name=selected_sheet,
-        header=None,
-        nrows=10,
+        "grid",
+        (selected_sheet, is_csv),
+        lambda: _siapkan_grid(_baca_grid_mentah(uploaded_file, selected_sheet, is_csv)),
+        pilih,
     )
 
 
-def baca_data_penuh(uploaded_file, selected_sheet, is_csv, header_row_input):
+def _nama_kolom(header_values):
+    nama_kolom = []
+    terpakai = {}
+    for posisi, value in enumerate(header_values):
+        nama = f"Unnamed: {posisi}" if pd.isna(value) or value == "" else str(value)
+        nama_unik = nama
+        while nama_unik in terpakai:
+            terpakai[nama] += 1
+            nama_unik = f"{nama}.{terpakai[nama]}"
+        terpakai.setdefault(nama_unik, 0)
+        nama_kolom.append(nama_unik)
+    return nama_kolom
+
+
+def baca_preview_mentah(uploaded_file, selected_sheet, is_csv):
+    return baca_grid(uploaded_file, selected_sheet, is_csv, lambda hasil: hasil["grid"].head(10))
+
+
+def _potong_data(hasil, header_row_input, hapus_baris_penomoran):
+    grid, kosong = hasil["grid"], hasil["kosong"]
     header_idx = header_row_input - 1
-    if is_csv:
-        uploaded_file.seek(0)
-        try:
-            return pd.read_csv(uploaded_file, header=header_idx, dtype=str)
-        except Exception:
-            uploaded_file.seek(0)
-            return pd.read_csv(uploaded_file, header=header_idx, sep=";", dtype=str)
-    return pd.read_excel(
+    if header_idx >= len(grid):
+        return pd.DataFrame()
+
+    df = grid.iloc[header_idx + 1:][~kosong[header_idx + 1:]]
+    kepala = hasil["kepala"] if header_idx < len(hasil["kepala"]) else grid
+    df = df.set_axis(_nama_kolom(kepala.iloc[header_idx].tolist()), axis=1)
+    df.index = df.index - (header_idx + 1)
+
+    if hapus_baris_penomoran and not df.empty:
+        df = df.iloc[1:].reset_index(drop=True)
+    return df
+
+
+def baca_data_penuh(uploaded_file, selected_sheet, is_csv, header_row_input, hapus_baris_penomoran=False):
+    return baca_grid(
         uploaded_file,
-        sheet_name=selected_sheet,
-        header=header_idx,
-        dtype=str,
+        selected_sheet,
+        is_csv,
+        lambda hasil: _potong_data(hasil, header_row_input, hapus_baris_penomoran),
     )
 
 
+def _normalisasi_sel(teks):
+    if teks == "nan":
+        return ""
+    if ".0" in teks:
+        teks = _POLA_NOL_DESIMAL.sub("", teks)
+    if ":" in teks:
+        teks = _POLA_TANGGAL_WAKTU.sub(r"\3/\2/\1", teks)
+    return teks
+
+
+def _dtype_arrow(dtype):
+    return isinstance(dtype, pd.StringDtype) and dtype.storage == "pyarrow"
+
+
+def _normalisasi_kolom(values, dtype):
+    values = values.astype(str) if dtype is object else values.astype(dtype).fillna("")
+    if _dtype_arrow(values.dtype):
+        return (
+            values.replace("nan", "")
+            .str.replace(_POLA_NOL_DESIMAL.pattern, "", regex=True)
+            .str.replace(_POLA_TANGGAL_WAKTU.pattern, r"\3/\2/\1", regex=True)
+        )
+
+    teks = values.to_numpy(dtype=object)
+    terisi = pd.notna(teks)
+    isi = teks if terisi.all() else teks[terisi]
+    gabungan = "\x00".join(isi)
+    if "nan" not in gabungan and ".0" not in gabungan and ":" not in gabungan:
+        return values
+
+    hasil = teks.copy()
+    hasil[terisi] = [_normalisasi_sel(nilai) for nilai in isi]
+    return pd.Series(hasil, index=values.index, dtype=values.dtype)
+
+
+def normalisasi_teks(df):
+    dtype = dtype_teks()
+    kolom = [df.iloc[:, posisi] for posisi in range(df.shape[1])]
+    dtype_hasil = pd.Series([], dtype=str).dtype if dtype is object else dtype
+    if len(kolom) >= KOLOM_PARALEL_MIN and _dtype_arrow(dtype_hasil):
+        with ThreadPoolExecutor(max_workers=min(len(kolom), os.cpu_count() or 1)) as executor:
+            hasil = list(executor.map(lambda values: _normalisasi_kolom(values, dtype), kolom))
+    else:
+        hasil = [_normalisasi_kolom(values, dtype) for values in kolom]
+    return pd.concat(hasil, axis=1, ignore_index=True).set_axis(df.columns, axis=1) if hasil else df.astype(str)
+
+
 def siapkan_dataframe(df, hapus_baris_penomoran):
     df = df.copy()
     df.dropna(how="all", inplace=True)
@@ -41,16 +227,29 @@ def siapkan_dataframe(df, hapus_baris_penomoran):
     if hapus_baris_penomoran and not df.empty:
         df = df.iloc[1:].reset_index(drop=True)
 
-    df = df.astype(str)
-    for col in df.columns:
-        df[col] = df[col].replace("nan", "").str.replace(r"\.0$", "", regex=True)
-        df[col] = df[col].str.replace(
-            r'^(\d{4})-(\d{2})-(\d{2}) \d{2}:\d{2}:\d{2}$',
-            r'\3/\2/\1',
-            regex=True,
-        )
+    return normalisasi_teks(df)
 
-    return df
+
+def _hitung_memori_teks(df, dtype):
+    jumlah_baris = max(len(df), 1)
+    bytes_aktif = int(df.memory_usage(index=False, deep=True).sum())
+    bytes_object = int(df.astype(object).memory_usage(index=False, deep=True).sum())
+    return {
+        "dtype": f"string[{dtype.storage}]" if isinstance(dtype, pd.StringDtype) else "object",
+        "bytes_per_baris": bytes_aktif / jumlah_baris,
+        "bytes_per_baris_object": bytes_object / jumlah_baris,
+        "rasio": bytes_aktif / bytes_object if bytes_object else 1.0,
+    }
+
+
+def laporan_memori_teks(uploaded_file, selected_sheet, is_csv):
+    dtype = dtype_teks()
+    return muat_dengan_cache(
+        uploaded_file,
+        "memori_teks",
+        (selected_sheet, is_csv, str(dtype)),
+        lambda: baca_grid(uploaded_file, selected_sheet, is_csv, lambda hasil: _hitung_memori_teks(hasil["grid"], dtype)),
+    )
 
 
 def tampilkan_nomor_baris_excel(df):
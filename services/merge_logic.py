@@ -5,7 +5,7 @@ from zoneinfo import ZoneInfo
 
 import pandas as pd
 
-from services.file_loading import siapkan_dataframe
+from services.file_loading import baca_data_penuh, baca_katalog_sheet, dtype_teks
 
 
 SOURCE_FILE_COL = "SOURCE_FILE"
@@ -31,29 +31,13 @@ def is_csv_file(file_name: str) -> bool:
     return file_name.lower().endswith(".csv")
 
 
-def get_sheet_names(uploaded_file) -> list[str]:
-    if is_csv_file(uploaded_file.name):
-        return ["Sheet1"]
-
-    uploaded_file.seek(0)
-    excel_file = pd.ExcelFile(uploaded_file)
-    return excel_file.sheet_names
+def get_sheet_catalog(uploaded_file) -> list[dict]:
+    return baca_katalog_sheet(uploaded_file, is_csv_file(uploaded_file.name))
 
 
 def read_workbook_sheet(uploaded_file, sheet_name: str, header_row: int, hapus_baris_penomoran: bool) -> pd.DataFrame:
-    uploaded_file.seek(0)
-    header_idx = header_row - 1
-
-    if is_csv_file(uploaded_file.name):
-        try:
-            df = pd.read_csv(uploaded_file, header=header_idx, dtype=str)
-        except Exception:
-            uploaded_file.seek(0)
-            df = pd.read_csv(uploaded_file, header=header_idx, sep=";", dtype=str)
-    else:
-        df = pd.read_excel(uploaded_file, sheet_name=sheet_name, header=header_idx, dtype=str)
-
-    return siapkan_dataframe(df, hapus_baris_penomoran)
+    is_csv = is_csv_file(uploaded_file.name)
+    return baca_data_penuh(uploaded_file, "Sheet1" if is_csv else sheet_name, is_csv, header_row, hapus_baris_penomoran)
 
 
 def normalize_column_name(column_name: str) -> str:
@@ -108,10 +92,11 @@ def map_source_to_master(
     include_source_metadata: bool,
 ) -> pd.DataFrame:
     mapped_df = pd.DataFrame(index=source_df.index)
+    kolom_kosong = pd.Series("", index=source_df.index, dtype=dtype_teks())
 
     for master_col in master_columns:
         source_col = column_mapping.get(master_col, "")
-        mapped_df[master_col] = source_df[source_col] if source_col in source_df.columns else ""
+        mapped_df[master_col] = source_df[source_col] if source_col in source_df.columns else kolom_kosong
 
     if include_source_metadata:
         mapped_df[SOURCE_FILE_COL] = source_file
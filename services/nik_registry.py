@@ -0,0 +1,107 @@
+import os
+import sqlite3
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from services.validation_logic import kemas_nik
+
+
+REGISTRY_PATH = os.environ.get("NIK_REGISTRY_PATH", "nik_registry.sqlite3")
+STATUS_PERNAH_DIAJUKAN = "PERNAH DIAJUKAN"
+STATUS_BELUM_DIAJUKAN = "BELUM PERNAH"
+BATCH_SIZE = 50_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pengajuan (
+    id INTEGER PRIMARY KEY,
+    nama_file TEXT NOT NULL,
+    nama_sheet TEXT NOT NULL,
+    waktu TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nik_terdaftar (
+    nik INTEGER NOT NULL,
+    pengajuan_id INTEGER NOT NULL REFERENCES pengajuan(id),
+    PRIMARY KEY (nik, pengajuan_id)
+) WITHOUT ROWID;
+"""
+
+
+def _buka_registry(path=None) -> sqlite3.Connection:
+    conn = sqlite3.connect(path or REGISTRY_PATH)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _nik_unik(values: pd.Series) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    packed, valid = kemas_nik(values)
+    return packed, valid, np.unique(packed[valid])
+
+
+def _batches(nik_unik: np.ndarray, *extra):
+    for awal in range(0, len(nik_unik), BATCH_SIZE):
+        yield [(int(nik), *extra) for nik in nik_unik[awal:awal + BATCH_SIZE]]
+
+
+def daftarkan_nik(values: pd.Series, nama_file: str, nama_sheet: str, path=None) -> int:
+    _, _, nik_unik = _nik_unik(values)
+    waktu = datetime.now(ZoneInfo("Asia/Jakarta")).strftime("%Y-%m-%d %H:%M:%S")
+
+    conn = _buka_registry(path)
+    try:
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO pengajuan (nama_file, nama_sheet, waktu) VALUES (?, ?, ?)",
+                (nama_file, nama_sheet, waktu),
+            )
+            for batch in _batches(nik_unik, cursor.lastrowid):
+                conn.executemany("INSERT OR IGNORE INTO nik_terdaftar (nik, pengajuan_id) VALUES (?, ?)", batch)
+    finally:
+        conn.close()
+    return len(nik_unik)
+
+
+def cari_riwayat_nik(values: pd.Series, path=None) -> pd.Series:
+    packed, valid, nik_unik = _nik_unik(values)
+    riwayat = np.full(len(values), "", dtype=object)
+    if not len(nik_unik):
+        return pd.Series(riwayat, index=values.index, dtype=object)
+
+    conn = _buka_registry(path)
+    try:
+        conn.execute("CREATE TEMP TABLE cari_nik (nik INTEGER PRIMARY KEY)")
+        for batch in _batches(nik_unik):
+            conn.executemany("INSERT INTO cari_nik (nik) VALUES (?)", batch)
+        rows = conn.execute(
+            """
+            SELECT c.nik, p.nama_file, p.nama_sheet, MAX(p.waktu)
+            FROM cari_nik c
+            JOIN nik_terdaftar n ON n.nik = c.nik
+            JOIN pengajuan p ON p.id = n.pengajuan_id
+            GROUP BY c.nik
+            ORDER BY c.nik
+            """
+        ).fetchall()
+    finally:
+        conn.close()
+
+    if rows:
+        ditemukan = np.array([row[0] for row in rows], dtype=np.uint64)
+        label = np.array([f"{row[1]} | {row[2]} | {row[3]}" for row in rows], dtype=object)
+        posisi = np.minimum(np.searchsorted(ditemukan, packed), len(ditemukan) - 1)
+        cocok = valid & (ditemukan[posisi] == packed)
+        riwayat[cocok] = label[posisi[cocok]]
+    return pd.Series(riwayat, index=values.index, dtype=object)
+
+
+def proses_riwayat_pengajuan(df_result, col_name, path=None):
+    riwayat_col = f"RIWAYAT_{col_name}"
+    pengajuan_col = f"PENGAJUAN_TERAKHIR_{col_name}"
+    riwayat = cari_riwayat_nik(df_result[col_name], path)
+    df_result[riwayat_col] = np.where(riwayat.ne(""), STATUS_PERNAH_DIAJUKAN, STATUS_BELUM_DIAJUKAN)
+    df_result[pengajuan_col] = riwayat
+    return df_result, riwayat_col, pengajuan_col
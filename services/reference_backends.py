@@ -0,0 +1,182 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.validation_logic import buat_indeks_referensi
+
+
+KOLOM_NIK = "D"
+FULL_RESYNC_SECONDS = 24 * 3600
+SQLITE_FETCH_SIZE = 100_000
+
+
+def _buka_worksheet(nama_worksheet):
+    import gspread
+    import streamlit as st
+    from google.oauth2.service_account import Credentials
+
+    scopes = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+    creds = Credentials.from_service_account_info(
+        st.secrets["gcp_service_account"], scopes=scopes
+    )
+    client = gspread.authorize(creds)
+    return client.open_by_key(st.secrets["SPREADSHEET_ID"]).worksheet(nama_worksheet)
+
+
+def _ambil_rentang(sheet, awal):
+    rows = sheet.get(f"{KOLOM_NIK}{awal}:{KOLOM_NIK}")
+    return [str(row[0]).strip() if row else "" for row in rows]
+
+
+def _checksum_baris(values):
+    return hashlib.sha256("\x1f".join(values).encode("utf-8")).hexdigest()
+
+
+def _info_sinkron(kolom_nik, full_sync_epoch, mode):
+    return {
+        "jumlah_baris": len(kolom_nik),
+        "checksum_kolom": _checksum_baris(kolom_nik),
+        "full_sync_epoch": full_sync_epoch,
+        "mode_sinkron": mode,
+    }
+
+
+def _awalan_tidak_berubah(kolom_nik, metadata):
+    if not metadata or "checksum_kolom" not in metadata:
+        return False
+    if time.time() - metadata.get("full_sync_epoch", 0) >= FULL_RESYNC_SECONDS:
+        return False
+    jumlah_baris = metadata["jumlah_baris"]
+    if jumlah_baris < 2 or len(kolom_nik) < jumlah_baris:
+        return False
+    return _checksum_baris(kolom_nik[:jumlah_baris]) == metadata["checksum_kolom"]
+
+
+def sinkronkan_nik_salur(sheet, indeks=None, metadata=None):
+    kolom_nik = _ambil_rentang(sheet, 1)
+    while kolom_nik and not kolom_nik[-1]:
+        kolom_nik.pop()
+
+    if indeks is not None and _awalan_tidak_berubah(kolom_nik, metadata):
+        baru = [nik for nik in kolom_nik[metadata["jumlah_baris"]:] if nik]
+        indeks_baru = np.union1d(indeks, buat_indeks_referensi(baru)) if baru else indeks
+        return indeks_baru, _info_sinkron(kolom_nik, metadata["full_sync_epoch"], "delta")
+
+    indeks_baru = buat_indeks_referensi(nik for nik in kolom_nik[1:] if nik)
+    return indeks_baru, _info_sinkron(kolom_nik, time.time(), "penuh")
+
+
+class BackendReferensi:
+    nama = ""
+
+    @property
+    def sumber(self):
+        raise NotImplementedError
+
+    def muat_indeks(self, indeks=None, metadata=None):
+        raise NotImplementedError
+
+
+class BackendGoogleSheets(BackendReferensi):
+    nama = "gsheets"
+
+    def __init__(self, nama_worksheet="BNBA", sheet=None):
+        self.nama_worksheet = nama_worksheet
+        self._sheet = sheet
+
+    @property
+    def sumber(self):
+        return f"{self.nama}:{self.nama_worksheet}"
+
+    def muat_indeks(self, indeks=None, metadata=None):
+        sheet = self._sheet or _buka_worksheet(self.nama_worksheet)
+        indeks_baru, info = sinkronkan_nik_salur(sheet, indeks, metadata)
+        return indeks_baru, {**info, "sumber": self.sumber}
+
+
+def _tanda_file(path):
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class BackendFileLokal(BackendReferensi):
+    nama = "file"
+
+    def __init__(self, path, kolom="NIK"):
+        self.path = path
+        self.kolom = kolom
+
+    @property
+    def sumber(self):
+        return f"{self.nama}:{self.path}"
+
+    def _baca_kolom(self):
+        if self.path.lower().endswith(".parquet"):
+            return pd.read_parquet(self.path, columns=[self.kolom])[self.kolom]
+        with open(self.path, encoding="utf-8", errors="ignore") as f:
+            baris_pertama = f.readline()
+        sep = ";" if baris_pertama.count(";") > baris_pertama.count(",") else ","
+        return pd.read_csv(self.path, usecols=[self.kolom], dtype=str, sep=sep)[self.kolom]
+
+    def muat_indeks(self, indeks=None, metadata=None):
+        tanda = _tanda_file(self.path)
+        info = {"sumber": self.sumber, "tanda_file": tanda}
+        if indeks is not None and metadata and metadata.get("tanda_file") == tanda:
+            return indeks, {**info, "mode_sinkron": "tidak berubah"}
+
+        values = self._baca_kolom().dropna()
+        return buat_indeks_referensi(values), {**info, "mode_sinkron": "penuh"}
+
+
+class BackendSQLite(BackendReferensi):
+    nama = "sqlite"
+
+    def __init__(self, path, tabel="bnba", kolom="nik"):
+        self.path = path
+        self.tabel = tabel
+        self.kolom = kolom
+
+    @property
+    def sumber(self):
+        return f"{self.nama}:{self.path}:{self.tabel}.{self.kolom}"
+
+    def muat_indeks(self, indeks=None, metadata=None):
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            cursor = conn.execute(
+                f'SELECT "{self.kolom}" FROM "{self.tabel}" WHERE "{self.kolom}" IS NOT NULL'
+            )
+            bagian = []
+            while rows := cursor.fetchmany(SQLITE_FETCH_SIZE):
+                bagian.append(buat_indeks_referensi(row[0] for row in rows))
+        finally:
+            conn.close()
+
+        indeks_baru = np.unique(np.concatenate(bagian)) if bagian else buat_indeks_referensi([])
+        return indeks_baru, {"sumber": self.sumber, "mode_sinkron": "penuh"}
+
+
+def _spesifikasi_dari_env():
+    return {
+        "jenis": os.environ.get("SALUR_BACKEND", BackendGoogleSheets.nama),
+        "path": os.environ.get("SALUR_BACKEND_PATH", ""),
+        "worksheet": os.environ.get("SALUR_BACKEND_WORKSHEET"),
+        "tabel": os.environ.get("SALUR_BACKEND_TABEL"),
+        "kolom": os.environ.get("SALUR_BACKEND_KOLOM"),
+    }
+
+
+def buat_backend(spesifikasi=None):
+    spesifikasi = spesifikasi or _spesifikasi_dari_env()
+    jenis = spesifikasi.get("jenis", BackendGoogleSheets.nama)
+    if jenis == BackendFileLokal.nama:
+        return BackendFileLokal(spesifikasi["path"], spesifikasi.get("kolom") or "NIK")
+    if jenis == BackendSQLite.nama:
+        return BackendSQLite(spesifikasi["path"], spesifikasi.get("tabel") or "bnba", spesifikasi.get("kolom") or "nik")
+    if jenis == BackendGoogleSheets.nama:
+        return BackendGoogleSheets(spesifikasi.get("worksheet") or "BNBA")
+    raise ValueError(f"Backend referensi tidak dikenal: {jenis}")
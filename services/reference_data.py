@@ -1,27 +1,253 @@
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-import gspread
+import numpy as np
 import streamlit as st
-from google.oauth2.service_account import Credentials
 
+from config import PROGRAM_REFERENSI
+from services.reference_backends import buat_backend
+from services.reference_registry import RegistriReferensi
+from services.validation_logic import buat_indeks_referensi
 
-@st.cache_data(ttl=3600)
-def ambil_data_salur_gspread():
+
+SNAPSHOT_DIR = os.environ.get("SALUR_SNAPSHOT_DIR", "reference_snapshot")
+SNAPSHOT_TTL_SECONDS = 3600
+SNAPSHOT_RETRY_SECONDS = 300
+PREFETCH_INTERVAL_SECONDS = 60
+
+
+def _snapshot_folder(folder=None):
+    return folder or SNAPSHOT_DIR
+
+
+def _hapus_array_lama(folder, nama, berkas_aktif):
+    pola = re.compile(rf"{re.escape(nama)}(\.[0-9a-f]{{32}})?\.npy")
+    for berkas in os.listdir(folder):
+        if berkas != berkas_aktif and pola.fullmatch(berkas):
+            try:
+                os.remove(os.path.join(folder, berkas))
+            except OSError:
+                pass
+
+
+def simpan_snapshot(indeks, metadata, nama, folder=None):
+    folder = _snapshot_folder(folder)
+    os.makedirs(folder, exist_ok=True)
+
+    berkas_array = f"{nama}.{uuid.uuid4().hex}.npy"
+    with open(os.path.join(folder, berkas_array), "wb") as f:
+        np.save(f, np.ascontiguousarray(indeks, dtype=np.uint64))
+    meta_path = os.path.join(folder, f"{nama}.json")
+    tmp_meta_path = f"{meta_path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_meta_path, "w") as f:
+        json.dump({**metadata, "jumlah": int(len(indeks)), "berkas_array": berkas_array}, f)
+
+    os.replace(tmp_meta_path, meta_path)
+    _hapus_array_lama(folder, nama, berkas_array)
+
+
+def muat_snapshot(nama, folder=None):
+    folder = _snapshot_folder(folder)
+    meta_path = os.path.join(folder, f"{nama}.json")
+    if not os.path.exists(meta_path):
+        return None, None
     try:
-        scopes = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
-        creds = Credentials.from_service_account_info(
-            st.secrets["gcp_service_account"], scopes=scopes
-        )
-        client = gspread.authorize(creds)
-        sheet = client.open_by_key(st.secrets["SPREADSHEET_ID"]).worksheet("BNBA")
+        with open(meta_path) as f:
+            metadata = json.load(f)
+        indeks = np.load(os.path.join(folder, metadata.get("berkas_array", f"{nama}.npy")), mmap_mode="r")
+    except (OSError, ValueError):
+        return None, None
+    if len(indeks) != metadata.get("jumlah", len(indeks)):
+        return None, None
+    return indeks, metadata
 
-        kolom_nik = sheet.col_values(4)
-        set_nik_salur = {str(nik).strip() for nik in kolom_nik[1:] if nik}
-        waktu_update = datetime.now(ZoneInfo("Asia/Jakarta")).strftime("%d %b %Y, %H:%M:%S WIB")
 
-        return set_nik_salur, waktu_update
+def _indeks_baca_saja(indeks):
+    if indeks.flags.writeable:
+        indeks = np.array(indeks, dtype=np.uint64)
+        indeks.setflags(write=False)
+    return indeks
+
+
+@dataclass(frozen=True)
+class IndeksReferensi:
+    nik: np.ndarray
+    waktu_update: str
+    disimpan_epoch: float
+    diperiksa_epoch: float
+    pesan: str = ""
+    galat: str = ""
+
+    @property
+    def label(self):
+        return f"{self.waktu_update} ({self.pesan})" if self.pesan else self.waktu_update
+
+
+def _muat_referensi_program(program, saat_ini=None):
+    if saat_ini is not None and time.time() - saat_ini.diperiksa_epoch < SNAPSHOT_TTL_SECONDS:
+        return saat_ini
+    nama_snapshot = program["kode"].lower()
+    backend = buat_backend(program.get("backend"))
+    indeks, metadata = muat_snapshot(nama_snapshot)
+    if indeks is not None and metadata.get("sumber", backend.sumber) != backend.sumber:
+        indeks, metadata = None, None
+    if saat_ini is None and indeks is not None:
+        disimpan_epoch = metadata["disimpan_epoch"]
+        return IndeksReferensi(indeks, metadata["waktu_update"], disimpan_epoch, disimpan_epoch)
+
+    try:
+        indeks_baru, info_sinkron = backend.muat_indeks(indeks, metadata)
+        waktu_update = datetime.now(ZoneInfo("Asia/Jakarta")).strftime("%d %b %Y, %H:%M:%S WIB")
+        disimpan_epoch = time.time()
+        simpan_snapshot(
+            indeks_baru,
+            {"waktu_update": waktu_update, "disimpan_epoch": disimpan_epoch, **info_sinkron},
+            nama_snapshot,
+        )
+        indeks, _ = muat_snapshot(nama_snapshot)
+        return IndeksReferensi(
+            _indeks_baca_saja(indeks if indeks is not None else indeks_baru),
+            waktu_update,
+            disimpan_epoch,
+            disimpan_epoch,
+        )
 
     except Exception as e:
-        return set(), f"Gagal mengambil data: {e}"
+        pesan = f"snapshot lokal, gagal memperbarui: {e}"
+        if saat_ini is not None:
+            return IndeksReferensi(
+                saat_ini.nik, saat_ini.waktu_update, saat_ini.disimpan_epoch, saat_ini.diperiksa_epoch, pesan, str(e)
+            )
+        return IndeksReferensi(
+            _indeks_baca_saja(buat_indeks_referensi([])), f"Gagal mengambil data: {e}", 0.0, 0.0, galat=str(e)
+        )
+
+
+def _muat_registri_referensi(saat_ini=None):
+    indeks_lama = {}
+    if saat_ini is not None:
+        indeks_lama = {program["kode"]: indeks for program, indeks in zip(saat_ini.program, saat_ini.indeks)}
+    indeks = [_muat_referensi_program(program, indeks_lama.get(program["kode"])) for program in PROGRAM_REFERENSI]
+    return RegistriReferensi.gabungkan(PROGRAM_REFERENSI, indeks)
+
+
+class PenyediaReferensi:
+    def __init__(self, muat_fn, ttl_seconds=SNAPSHOT_TTL_SECONDS, retry_seconds=SNAPSHOT_RETRY_SECONDS):
+        self._muat_fn = muat_fn
+        self._ttl_seconds = ttl_seconds
+        self._retry_seconds = retry_seconds
+        self._coba_lagi_epoch = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.RLock()
+        self._thread = None
+        self._jadwal = None
+        self._saat_ini = None
+        self.metrik = {
+            "jumlah_hit": 0,
+            "jumlah_refresh": 0,
+            "durasi_refresh_detik": None,
+            "refresh_terakhir_epoch": None,
+            "galat_terakhir": None,
+            "jumlah_nik": 0,
+            "ukuran_bytes": 0,
+            "sedang_refresh": False,
+        }
+
+    def _kedaluwarsa(self, referensi):
+        with self._lock:
+            coba_lagi_epoch = self._coba_lagi_epoch
+        if time.time() < coba_lagi_epoch:
+            return False
+        return time.time() - referensi.diperiksa_epoch >= self._ttl_seconds
 
+    def refresh(self):
+        with self._refresh_lock:
+            with self._lock:
+                self.metrik["sedang_refresh"] = True
+                saat_ini = self._saat_ini
+            mulai = time.perf_counter()
+            try:
+                referensi = self._muat_fn(saat_ini)
+            except Exception as e:
+                with self._lock:
+                    self.metrik["galat_terakhir"] = str(e)
+                    self._coba_lagi_epoch = time.time() + self._retry_seconds
+                raise
+            finally:
+                with self._lock:
+                    self.metrik["sedang_refresh"] = False
+            with self._lock:
+                self._saat_ini = referensi
+                self.metrik["jumlah_refresh"] += 1
+                self.metrik["durasi_refresh_detik"] = round(time.perf_counter() - mulai, 3)
+                self.metrik["refresh_terakhir_epoch"] = time.time()
+                self.metrik["galat_terakhir"] = referensi.galat or None
+                self._coba_lagi_epoch = time.time() + self._retry_seconds if referensi.galat else 0.0
+                self.metrik["jumlah_nik"] = int(len(referensi))
+                self.metrik["ukuran_bytes"] = int(referensi.nbytes)
+            return referensi
+
+    def refresh_latar(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(target=self.refresh, name="refresh-referensi", daemon=True)
+            self._thread.start()
+            return True
+
+    def _jalankan_jadwal(self, interval_seconds):
+        while True:
+            referensi = self._saat_ini
+            if referensi is None or self._kedaluwarsa(referensi):
+                try:
+                    self.refresh()
+                except Exception:
+                    pass
+                else:
+                    if referensi is None:
+                        continue
+            time.sleep(interval_seconds)
+
+    def mulai_prefetch(self, interval_seconds=PREFETCH_INTERVAL_SECONDS):
+        with self._lock:
+            if self._jadwal is not None:
+                return False
+            self._jadwal = threading.Thread(
+                target=self._jalankan_jadwal, args=(interval_seconds,), name="jadwal-referensi", daemon=True
+            )
+            self._jadwal.start()
+            return True
+
+    def ringkasan_metrik(self):
+        with self._lock:
+            return dict(self.metrik)
+
+    def ambil(self):
+        with self._lock:
+            self.metrik["jumlah_hit"] += 1
+            referensi = self._saat_ini
+        if referensi is None:
+            with self._refresh_lock:
+                return self._saat_ini if self._saat_ini is not None else self.refresh()
+        if self._kedaluwarsa(referensi):
+            self.refresh_latar()
+        return referensi
+
+
+@st.cache_resource
+def penyedia_referensi_salur():
+    penyedia = PenyediaReferensi(_muat_registri_referensi)
+    penyedia.mulai_prefetch()
+    return penyedia
+
+
+def ambil_data_salur_gspread():
+    registri = penyedia_referensi_salur().ambil()
+    return registri, registri.label
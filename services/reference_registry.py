@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from services.validation_logic import kemas_nik
+
+
+MAKS_PROGRAM = 32
+
+
+@dataclass(frozen=True)
+class RegistriReferensi:
+    program: tuple
+    indeks: tuple
+    kunci: np.ndarray
+    bitmask: np.ndarray | None = None
+
+    @classmethod
+    def gabungkan(cls, program, indeks):
+        program, indeks = tuple(program), tuple(indeks)
+        if len(program) > MAKS_PROGRAM:
+            raise ValueError(f"Registri referensi maksimal {MAKS_PROGRAM} program.")
+        if len(indeks) == 1:
+            return cls(program, indeks, indeks[0].nik)
+
+        kunci = np.unique(np.concatenate([item.nik for item in indeks])) if indeks else np.empty(0, dtype=np.uint64)
+        bitmask = np.zeros(len(kunci), dtype=np.uint32)
+        for nomor, item in enumerate(indeks):
+            bitmask[np.searchsorted(kunci, item.nik)] |= np.uint32(1 << nomor)
+        kunci.setflags(write=False)
+        bitmask.setflags(write=False)
+        return cls(program, indeks, kunci, bitmask)
+
+    def __len__(self):
+        return len(self.kunci)
+
+    @property
+    def nbytes(self):
+        return self.kunci.nbytes + (self.bitmask.nbytes if self.bitmask is not None else 0)
+
+    @property
+    def disimpan_epoch(self):
+        return min((item.disimpan_epoch for item in self.indeks), default=0.0)
+
+    @property
+    def diperiksa_epoch(self):
+        return min((item.diperiksa_epoch for item in self.indeks), default=0.0)
+
+    @property
+    def galat(self):
+        if len(self.indeks) == 1:
+            return self.indeks[0].galat
+        return "; ".join(f"{program['kode']}: {item.galat}" for program, item in zip(self.program, self.indeks) if item.galat)
+
+    @property
+    def label(self):
+        if len(self.indeks) == 1:
+            return self.indeks[0].label
+        return "\n\n".join(f"{program['kode']}: {item.label}" for program, item in zip(self.program, self.indeks))
+
+    def cari(self, values: pd.Series) -> np.ndarray:
+        packed, valid = kemas_nik(values)
+        if not len(self.kunci):
+            return np.zeros(len(packed), dtype=np.uint32)
+        posisi = np.minimum(np.searchsorted(self.kunci, packed), len(self.kunci) - 1)
+        cocok = valid & (self.kunci[posisi] == packed)
+        if self.bitmask is None:
+            return cocok.astype(np.uint32)
+        return np.where(cocok, self.bitmask[posisi], 0).astype(np.uint32)
+
+    def status_program(self, mask: np.ndarray) -> np.ndarray:
+        status = np.full(len(mask), "", dtype=object)
+        for nomor in range(len(self.program) - 1, -1, -1):
+            status[(mask & np.uint32(1 << nomor)) != 0] = self.program[nomor]["status"]
+        return status
+
+    def label_program(self, mask: np.ndarray) -> np.ndarray:
+        unik, inverse = np.unique(mask, return_inverse=True)
+        label = np.array(
+            [
+                ", ".join(program["kode"] for nomor, program in enumerate(self.program) if nilai & (1 << nomor))
+                for nilai in unik.tolist()
+            ],
+            dtype=object,
+        )
+        return label[inverse.ravel()]
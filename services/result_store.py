@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+
+RESULT_STORE_DIR = os.environ.get("RESULT_STORE_DIR", "result_store")
+RESULT_STORE_MAX_BYTES = int(os.environ.get("RESULT_STORE_MAX_MB", "2048")) * 1024 ** 2
+RESULT_STORE_MAX_AGE_SECONDS = int(os.environ.get("RESULT_STORE_MAX_AGE_HOURS", "24")) * 3600
+
+_lock_evict = threading.Lock()
+
+
+def kunci_hasil(jenis, hash_file, opsi):
+    konten = json.dumps({"jenis": jenis, "file": hash_file, "opsi": opsi}, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(konten.encode("utf-8")).hexdigest()
+
+
+def _folder_hasil(kunci, folder=None):
+    return os.path.join(folder or RESULT_STORE_DIR, kunci[:2], kunci)
+
+
+def _nama_berkas(nama):
+    return hashlib.sha1(nama.encode("utf-8")).hexdigest()[:16]
+
+
+def _simpan_frame(df, path_dasar):
+    try:
+        df.to_parquet(f"{path_dasar}.parquet", index=True)
+        return "parquet"
+    except (ImportError, ValueError, TypeError, NotImplementedError):
+        if os.path.exists(f"{path_dasar}.parquet"):
+            os.remove(f"{path_dasar}.parquet")
+        df.to_pickle(f"{path_dasar}.pkl")
+        return "pkl"
+
+
+def _muat_frame(path_dasar, format_frame):
+    if format_frame == "parquet":
+        return pd.read_parquet(f"{path_dasar}.parquet")
+    return pd.read_pickle(f"{path_dasar}.pkl")
+
+
+def simpan_hasil(kunci, frames=None, berkas=None, meta=None, folder=None):
+    tujuan = _folder_hasil(kunci, folder)
+    if os.path.exists(tujuan):
+        return tujuan
+
+    sementara = f"{tujuan}.{uuid.uuid4().hex}.tmp"
+    os.makedirs(sementara)
+    try:
+        isi = {"frames": {}, "berkas": {}, "meta": meta or {}, "dibuat_epoch": time.time()}
+        for nama, df in (frames or {}).items():
+            path_dasar = os.path.join(sementara, f"frame_{_nama_berkas(nama)}")
+            isi["frames"][nama] = {"berkas": os.path.basename(path_dasar), "format": _simpan_frame(df, path_dasar)}
+        for nama, data in (berkas or {}).items():
+            nama_berkas = f"berkas_{_nama_berkas(nama)}.bin"
+            with open(os.path.join(sementara, nama_berkas), "wb") as f:
+                f.write(data)
+            isi["berkas"][nama] = nama_berkas
+        with open(os.path.join(sementara, "isi.json"), "w") as f:
+            json.dump(isi, f, default=str)
+        os.replace(sementara, tujuan)
+    except OSError:
+        if not os.path.exists(tujuan):
+            raise
+    finally:
+        shutil.rmtree(sementara, ignore_errors=True)
+
+    bersihkan_store(folder=folder)
+    return tujuan
+
+
+def _kedaluwarsa(isi, max_age_seconds=None):
+    max_age_seconds = RESULT_STORE_MAX_AGE_SECONDS if max_age_seconds is None else max_age_seconds
+    return time.time() - isi.get("dibuat_epoch", 0) > max_age_seconds
+
+
+def ambil_hasil(kunci, folder=None):
+    sumber = _folder_hasil(kunci, folder)
+    path_isi = os.path.join(sumber, "isi.json")
+    try:
+        with open(path_isi) as f:
+            isi = json.load(f)
+        if _kedaluwarsa(isi):
+            shutil.rmtree(sumber, ignore_errors=True)
+            return None
+        frames = {
+            nama: _muat_frame(os.path.join(sumber, info["berkas"]), info["format"])
+            for nama, info in isi["frames"].items()
+        }
+        berkas = {}
+        for nama, nama_berkas in isi["berkas"].items():
+            with open(os.path.join(sumber, nama_berkas), "rb") as f:
+                berkas[nama] = f.read()
+        os.utime(path_isi)
+    except (OSError, ValueError, KeyError):
+        return None
+    return {"frames": frames, "berkas": berkas, "meta": isi["meta"]}
+
+
+def _ukuran_folder(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def bersihkan_store(max_bytes=None, folder=None, max_age_seconds=None):
+    max_bytes = RESULT_STORE_MAX_BYTES if max_bytes is None else max_bytes
+    folder = folder or RESULT_STORE_DIR
+    with _lock_evict:
+        entri = []
+        for prefix in os.listdir(folder) if os.path.isdir(folder) else []:
+            folder_prefix = os.path.join(folder, prefix)
+            if not os.path.isdir(folder_prefix):
+                continue
+            for kunci in os.listdir(folder_prefix):
+                path = os.path.join(folder_prefix, kunci)
+                path_isi = os.path.join(path, "isi.json")
+                if kunci.endswith(".tmp") or not os.path.exists(path_isi):
+                    continue
+                try:
+                    with open(path_isi) as f:
+                        kedaluwarsa = _kedaluwarsa(json.load(f), max_age_seconds)
+                except (OSError, ValueError):
+                    kedaluwarsa = True
+                if kedaluwarsa:
+                    shutil.rmtree(path, ignore_errors=True)
+                    continue
+                entri.append((os.path.getmtime(path_isi), _ukuran_folder(path), path))
+
+        total = sum(ukuran for _, ukuran, _ in entri)
+        for _, ukuran, path in sorted(entri):
+            if total <= max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= ukuran
+        return total
@@ -4,6 +4,8 @@ from typing import Iterable
 
 import pandas as pd
 
+from services.unique_mapping import dtype_teks_kolom, map_unique_values
+
 
 EMPTY_SPLIT_LABEL = "Kosong"
 INVALID_PATH_CHARS = set('/\\:*?"<>|')
@@ -43,7 +45,7 @@ def build_sheet_label(key: Iterable[str]) -> str:
 def prepare_split_dataframe(df: pd.DataFrame, split_columns: list[str]) -> pd.DataFrame:
     prepared = df.copy()
     for col in split_columns:
-        prepared[col] = prepared[col].apply(normalize_split_value)
+        prepared[col] = map_unique_values(prepared[col], normalize_split_value, dtype=dtype_teks_kolom(prepared[col]))
     return prepared
 
 
@@ -0,0 +1,133 @@
+import gzip
+
+import numpy as np
+import pandas as pd
+
+from services.file_loading import deteksi_dialek_csv, siapkan_dataframe
+from services.validation_logic import bersihkan_kolom_identitas, kemas_nik, proses_kolom, proses_kolom_usia
+
+
+DEFAULT_CHUNKSIZE = 100_000
+BATAS_CHUNK_PENAMPUNG = 8
+BATAS_KUNCI_PENAMPUNG = 2_000_000
+
+
+def _jumlah_tercatat(kunci: np.ndarray, jumlah: np.ndarray, dicari: np.ndarray) -> np.ndarray:
+    if not len(kunci):
+        return np.zeros(len(dicari), dtype=np.int64)
+    posisi = np.minimum(np.searchsorted(kunci, dicari), len(kunci) - 1)
+    return np.where(kunci[posisi] == dicari, jumlah[posisi], 0).astype(np.int64)
+
+
+class PenghitungKemunculan:
+    def __init__(self, batas_chunk=BATAS_CHUNK_PENAMPUNG, batas_kunci=BATAS_KUNCI_PENAMPUNG):
+        self.kunci = np.empty(0, dtype=np.uint64)
+        self.jumlah = np.empty(0, dtype=np.uint32)
+        self.lainnya = {}
+        self.batas_chunk = batas_chunk
+        self.batas_kunci = batas_kunci
+        self._penampung = []
+        self._ukuran_penampung = 0
+
+    def __len__(self):
+        self._gabungkan()
+        return len(self.kunci) + len(self.lainnya)
+
+    def _gabungkan(self):
+        if not self._penampung:
+            return
+        kunci = np.concatenate([self.kunci, *(bagian for bagian, _ in self._penampung)])
+        jumlah = np.concatenate([self.jumlah, *(bagian for _, bagian in self._penampung)])
+        urutan = np.argsort(kunci, kind="stable")
+        kunci, jumlah = kunci[urutan], jumlah[urutan]
+        awal = np.flatnonzero(np.r_[True, kunci[1:] != kunci[:-1]])
+        self.kunci = kunci[awal]
+        self.jumlah = np.add.reduceat(jumlah, awal).astype(np.uint32)
+        self._penampung = []
+        self._ukuran_penampung = 0
+
+    def _hitung_terkemas(self, kunci_chunk: np.ndarray) -> np.ndarray:
+        urutan = np.argsort(kunci_chunk, kind="stable")
+        terurut = kunci_chunk[urutan]
+        unik, awal, jumlah = np.unique(terurut, return_index=True, return_counts=True)
+        peringkat = np.arange(len(terurut)) - np.repeat(awal, jumlah)
+
+        sebelumnya = _jumlah_tercatat(self.kunci, self.jumlah, unik)
+        for kunci, jumlah_tertampung in self._penampung:
+            sebelumnya += _jumlah_tercatat(kunci, jumlah_tertampung, unik)
+
+        kemunculan = np.empty(len(terurut), dtype=np.int64)
+        kemunculan[urutan] = peringkat + 1 + np.repeat(sebelumnya, jumlah)
+
+        self._penampung.append((unik, jumlah.astype(np.uint32)))
+        self._ukuran_penampung += len(unik)
+        if len(self._penampung) >= self.batas_chunk or self._ukuran_penampung >= self.batas_kunci:
+            self._gabungkan()
+        return kemunculan
+
+    def hitung(self, values: pd.Series) -> pd.Series:
+        kunci, terkemas = kemas_nik(values)
+        kemunculan = np.ones(len(values), dtype=np.int64)
+        if terkemas.any():
+            kemunculan[terkemas] = self._hitung_terkemas(kunci[terkemas])
+
+        for posisi, value in zip(np.flatnonzero(~terkemas), values.to_numpy()[~terkemas]):
+            self.lainnya[value] = self.lainnya.get(value, 0) + 1
+            kemunculan[posisi] = self.lainnya[value]
+        return pd.Series(kemunculan, index=values.index)
+
+
+def baca_kolom_csv(uploaded_file, header_row_input) -> list[str]:
+    dialek = deteksi_dialek_csv(uploaded_file)
+    uploaded_file.seek(0)
+    df_header = pd.read_csv(uploaded_file, header=header_row_input - 1, dtype=str, nrows=0, **dialek)
+    uploaded_file.seek(0)
+    return [str(col) for col in df_header.columns]
+
+
+def validasi_csv_bertahap(
+    uploaded_file,
+    output_path,
+    header_row_input,
+    hapus_baris_penomoran,
+    target_cols,
+    use_auto_clean,
+    registri_referensi,
+    cols_tgl_lahir=None,
+    tgl_pengecekan=None,
+    dayfirst=True,
+    chunksize=DEFAULT_CHUNKSIZE,
+    progress_callback=None,
+):
+    dialek = deteksi_dialek_csv(uploaded_file)
+    penghitung = {col_name: PenghitungKemunculan() for col_name in target_cols}
+    rekap_status = {col_name: {} for col_name in target_cols}
+    rekap_kategori = {col_tgl: {} for col_tgl in cols_tgl_lahir or []}
+    total_baris = 0
+
+    uploaded_file.seek(0)
+    reader = pd.read_csv(uploaded_file, header=header_row_input - 1, dtype=str, chunksize=chunksize, **dialek)
+    with gzip.open(output_path, "wt", encoding="utf-8", newline="") as output:
+        for nomor_chunk, chunk in enumerate(reader):
+            df_chunk = siapkan_dataframe(chunk, hapus_baris_penomoran and nomor_chunk == 0)
+            df_chunk.index = pd.RangeIndex(total_baris, total_baris + len(df_chunk))
+
+            for col_name in target_cols:
+                df_chunk[col_name] = bersihkan_kolom_identitas(df_chunk[col_name], use_auto_clean)
+                counts = penghitung[col_name].hitung(df_chunk[col_name])
+                df_chunk = proses_kolom(df_chunk, col_name, False, registri_referensi, counts=counts)
+                for status, jumlah in df_chunk[f"STATUS_{col_name}"].value_counts().items():
+                    rekap_status[col_name][status] = rekap_status[col_name].get(status, 0) + int(jumlah)
+
+            for col_tgl in cols_tgl_lahir or []:
+                df_chunk, _, kategori_col, _, _ = proses_kolom_usia(df_chunk, col_tgl, tgl_pengecekan, dayfirst=dayfirst)
+                for kategori, jumlah in df_chunk[kategori_col].value_counts().items():
+                    rekap_kategori[col_tgl][kategori] = rekap_kategori[col_tgl].get(kategori, 0) + int(jumlah)
+
+            df_chunk.to_csv(output, index=False, header=nomor_chunk == 0)
+            total_baris += len(df_chunk)
+            if progress_callback:
+                progress_callback(total_baris)
+
+    uploaded_file.seek(0)
+    return {"total_baris": total_baris, "rekap_status": rekap_status, "rekap_kategori": rekap_kategori}
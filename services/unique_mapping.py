@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+
+def factorize_column(values: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return codes, pd.Index(uniques, dtype=object)
+
+
+def dtype_teks_kolom(values: pd.Series):
+    return values.dtype if isinstance(values.dtype, pd.StringDtype) else object
+
+
+def broadcast_unique_results(results, codes: np.ndarray, index, dtype=object) -> pd.Series:
+    if isinstance(dtype, pd.StringDtype):
+        return pd.Series(pd.array(results, dtype=dtype).take(codes), index=index)
+    return pd.Series(np.asarray(results, dtype=dtype)[codes], index=index, dtype=dtype)
+
+
+def map_unique_values(values: pd.Series, func, dtype=object) -> pd.Series:
+    codes, uniques = factorize_column(values)
+    results = np.empty(len(uniques), dtype=object)
+    for idx, value in enumerate(uniques):
+        results[idx] = func(value)
+    return broadcast_unique_results(results, codes, values.index, dtype=dtype)
@@ -1,11 +1,12 @@
 import re as _re
 from datetime import datetime, timedelta as _timedelta
-from difflib import get_close_matches as _get_close_matches
 
 from dateutil import parser as dateutil_parser
+import numpy as np
 import pandas as pd
 
-from config import SPLIT_HELP_TEXT, TEXT_COLUMNS_KEYWORDS
+from config import BATAS_KATEGORI_UMUR, PROGRAM_REFERENSI, SPLIT_HELP_TEXT, TEXT_COLUMNS_KEYWORDS
+from services.unique_mapping import factorize_column, map_unique_values
 
 _BULAN_ID = {
     "januari": "January", "februari": "February", "maret": "March",
@@ -14,6 +15,23 @@ _BULAN_ID = {
     "oktober": "October", "november": "November", "desember": "December",
 }
 
+_VARIAN_BULAN = {
+    "January": ["january", "jan", "janu", "jnuari"],
+    "February": ["february", "feb", "febr", "pebruari", "peb"],
+    "March": ["march", "mar", "mrt"],
+    "April": ["apr", "aprl"],
+    "May": ["may"],
+    "June": ["june", "jun"],
+    "July": ["july", "jul"],
+    "August": ["august", "aug", "agu", "agt", "agst", "agus"],
+    "September": ["sept", "sep", "spt"],
+    "October": ["october", "oct", "okt"],
+    "November": ["nov", "nop", "nopember"],
+    "December": ["december", "dec", "des"],
+}
+
+_HURUF = "abcdefghijklmnopqrstuvwxyz"
+
 _FORMATS_PASTI = [
     "%Y/%m/%d", "%Y-%m-%d",
     "%d %b %Y", "%d %B %Y",
@@ -31,6 +49,67 @@ _FORMATS_AMBIGU_MONTHFIRST = [
     "%m|%d|%Y", "%m|%d|%y",
 ]
 
+
+def _edit_satu(kata: str) -> set:
+    potongan = [(kata[:i], kata[i:]) for i in range(len(kata) + 1)]
+    hapus = {kiri + kanan[1:] for kiri, kanan in potongan if kanan}
+    tukar = {kiri + kanan[1] + kanan[0] + kanan[2:] for kiri, kanan in potongan if len(kanan) > 1}
+    ganti = {kiri + huruf + kanan[1:] for kiri, kanan in potongan if kanan for huruf in _HURUF}
+    sisip = {kiri + huruf + kanan for kiri, kanan in potongan for huruf in _HURUF}
+    return hapus | tukar | ganti | sisip
+
+
+def _edit_dua_hapus(kata: str) -> set:
+    hasil = set()
+    for varian in _edit_satu(kata):
+        if len(varian) == len(kata) - 1:
+            hasil |= {varian[:i] + varian[i + 1:] for i in range(len(varian))}
+            hasil |= {varian[:i] + varian[i + 1] + varian[i] + varian[i + 2:] for i in range(len(varian) - 1)}
+    return hasil
+
+
+def _bangun_leksikon_bulan() -> dict:
+    pasti = {}
+    for kata, bulan in _BULAN_ID.items():
+        pasti[kata] = bulan
+    for bulan, daftar_kata in _VARIAN_BULAN.items():
+        for kata in daftar_kata:
+            pasti[kata] = bulan
+        pasti[bulan.lower()] = bulan
+
+    kandidat = {}
+    for kata, bulan in pasti.items():
+        if len(kata) < 4:
+            continue
+        varian = _edit_satu(kata)
+        if len(kata) >= 7:
+            varian |= _edit_dua_hapus(kata)
+        for item in varian:
+            if len(item) >= 3:
+                kandidat.setdefault(item, set()).add(bulan)
+
+    leksikon = {kata: bulan_set.pop() for kata, bulan_set in kandidat.items() if len(bulan_set) == 1}
+    leksikon.update(pasti)
+    return leksikon
+
+
+_LEKSIKON_BULAN = _bangun_leksikon_bulan()
+_NOMOR_BULAN = {
+    "January": 1, "February": 2, "March": 3, "April": 4, "May": 5, "June": 6,
+    "July": 7, "August": 8, "September": 9, "October": 10, "November": 11, "December": 12,
+}
+_BULAN_ANGKA = {kata: _NOMOR_BULAN[bulan] for kata, bulan in _LEKSIKON_BULAN.items()}
+_POLA_KATA_BULAN = _re.compile(r"[a-zA-Z]{3,}")
+
+_POLA_TANGGAL = {
+    "iso": r"(?P<tahun>[0-9]{4})([/-])(?P<bulan>[0-9]{1,2})\2(?P<hari>[0-9]{1,2})",
+    "numerik": r"(?P<a>[0-9]{1,2})([/-])(?P<b>[0-9]{1,2})\2(?P<tahun>[0-9]{4})",
+    "serial": r"(?P<serial>[0-9]{5,9})",
+    "nama_bulan": r"(?P<hari>[0-9]{1,2})([ /-])(?P<bulan>[A-Za-z]+)\2(?P<tahun>[0-9]{4})",
+}
+
+_SAMPEL_FORMAT_TANGGAL = 2000
+
 ADMIN_TYPE_TOKENS = {
     "kabupaten": "kabupaten",
     "kota": "kota",
@@ -43,63 +122,120 @@ ADMIN_TYPE_TOKENS = {
     "ds": "desa",
 }
 
+KODE_PROVINSI = {
+    11, 12, 13, 14, 15, 16, 17, 18, 19, 21,
+    31, 32, 33, 34, 35, 36,
+    51, 52, 53,
+    61, 62, 63, 64, 65,
+    71, 72, 73, 74, 75, 76,
+    81, 82,
+    91, 92, 93, 94, 95, 96,
+}
+
 
-def cek_validitas(row, col_name, temp_col, referensi_salur):
-    val = str(row[col_name]).replace(".0", "").strip()
-    count = row[temp_col]
+def _nilai_status(uniques) -> pd.Series:
+    return pd.Series(uniques, dtype=object).str.replace(".0", "", regex=False).str.strip()
 
-    if not val:
-        return "KOSONG"
-    if len(val) != 16:
-        return "TIDAK 16 DIGIT"
-    if not val.isdigit():
-        return "BUKAN ANGKA"
-    if val.endswith("000"):
-        return "TERKONVERSI (000)"
-    if val in referensi_salur:
-        return "SUDAH SALUR 2026"
-    if count == 1:
-        return "UNIK"
-    return f"GANDA {count}"
 
+def _faktor_nilai_status(values: pd.Series) -> tuple[np.ndarray, pd.Series]:
+    codes, uniques = factorize_column(values.astype(str))
+    return codes, _nilai_status(uniques)
 
-def proses_kolom(df_result, col_name, use_auto_clean, referensi_salur):
-    df_result[col_name] = df_result[col_name].replace("nan", "")
 
-    if use_auto_clean:
-        df_result[col_name] = (
-            df_result[col_name]
-            .str.replace(r"\.0$", "", regex=True)
-            .str.replace(r"\D", "", regex=True)
-        )
+def cari_program_nik(values: pd.Series, registri, faktor=None) -> np.ndarray:
+    if registri is None:
+        return np.zeros(len(values), dtype=np.uint32)
+    codes, val = faktor if faktor is not None else _faktor_nilai_status(values)
+    return registri.cari(val)[codes]
+
+
+def hitung_status_validitas(
+    values: pd.Series, counts: pd.Series, registri=None, mask_program=None, faktor=None
+) -> pd.Series:
+    codes, val = faktor if faktor is not None else _faktor_nilai_status(values)
+    panjang = val.str.len().to_numpy()[codes]
+    counts = counts.fillna(1).astype("int64")
+
+    if registri is None:
+        status_program = np.full(len(values), "", dtype=object)
     else:
-        df_result[col_name] = df_result[col_name].str.strip()
+        if mask_program is None:
+            mask_program = registri.cari(val)[codes]
+        status_program = registri.status_program(mask_program)
+
+    conditions = [
+        panjang == 0,
+        panjang != 16,
+        ~val.str.isdigit().to_numpy(dtype=bool)[codes],
+        val.str.endswith("000").to_numpy(dtype=bool)[codes],
+        status_program != "",
+        counts.eq(1).to_numpy(),
+    ]
+    choices = ["KOSONG", "TIDAK 16 DIGIT", "BUKAN ANGKA", "TERKONVERSI (000)", status_program, "UNIK"]
+    ganda = ("GANDA " + counts.astype(str)).to_numpy(dtype=object)
+    status = np.select(conditions, choices, default=ganda)
+    return pd.Series(status, index=values.index, dtype=object)
+
+
+def buat_indeks_referensi(values) -> np.ndarray:
+    packed, valid = kemas_nik(pd.Series(list(values), dtype=object).astype(str).str.strip())
+    return np.unique(packed[valid])
+
+
+def hitung_kemunculan(values: pd.Series) -> pd.Series:
+    packed, valid = kemas_nik(values)
+    kemunculan = np.ones(len(values), dtype=np.int64)
+
+    if valid.any():
+        kunci = packed[valid]
+        urutan = np.argsort(kunci, kind="stable")
+        terurut = kunci[urutan]
+        nomor = np.arange(len(terurut))
+        awal_grup = np.r_[True, terurut[1:] != terurut[:-1]]
+        hasil = np.empty(len(terurut), dtype=np.int64)
+        hasil[urutan] = nomor - np.maximum.accumulate(np.where(awal_grup, nomor, 0)) + 1
+        kemunculan[valid] = hasil
+
+    if not valid.all():
+        lainnya = values[~valid]
+        kemunculan[~valid] = (lainnya.groupby(lainnya).cumcount() + 1).fillna(1).to_numpy()
+    return pd.Series(kemunculan, index=values.index)
+
+
+def bersihkan_kolom_identitas(values: pd.Series, use_auto_clean) -> pd.Series:
+    values = values.replace("nan", "")
+    if use_auto_clean:
+        return values.str.replace(r"\.0$", "", regex=True).str.replace(r"\D", "", regex=True)
+    return values.str.strip()
+
 
-    temp_col = f"__temp_count_{col_name}"
-    df_result[temp_col] = df_result.groupby(col_name).cumcount() + 1
+def proses_kolom(df_result, col_name, use_auto_clean, registri_referensi, counts=None):
+    df_result[col_name] = bersihkan_kolom_identitas(df_result[col_name], use_auto_clean)
 
-    ref = referensi_salur if "NIK" in col_name.upper() else set()
+    if counts is None:
+        counts = hitung_kemunculan(df_result[col_name])
+
+    registri = registri_referensi if "NIK" in col_name.upper() else None
+    faktor = _faktor_nilai_status(df_result[col_name])
+    mask_program = cari_program_nik(df_result[col_name], registri, faktor)
     status_col = f"STATUS_{col_name}"
-    df_result[status_col] = df_result.apply(
-        lambda row: cek_validitas(row, col_name, temp_col, ref), axis=1
-    )
-    df_result.drop(columns=[temp_col], inplace=True)
+    df_result[status_col] = hitung_status_validitas(df_result[col_name], counts, registri, mask_program, faktor)
+    if registri is not None and len(registri.program) > 1:
+        df_result[f"PROGRAM_{col_name}"] = registri.label_program(mask_program)
     return df_result
 
 
+def _ganti_kata_bulan(match) -> str:
+    kata = match.group(0)
+    return _LEKSIKON_BULAN.get(kata.lower(), kata)
+
+
 def _ganti_bulan_id(tgl_str: str) -> str:
-    kata_list = _re.findall(r"[a-zA-Z]{3,}", tgl_str)
-    hasil = tgl_str
-    for kata in kata_list:
-        kata_lower = kata.lower()
-        if kata_lower in _BULAN_ID:
-            hasil = _re.sub(kata, _BULAN_ID[kata_lower], hasil, flags=_re.IGNORECASE)
-        else:
-            cutoff = 0.75 if len(kata_lower) <= 5 else 0.6
-            cocok = _get_close_matches(kata_lower, _BULAN_ID.keys(), n=1, cutoff=cutoff)
-            if cocok:
-                hasil = _re.sub(kata, _BULAN_ID[cocok[0]], hasil, flags=_re.IGNORECASE)
-    return hasil
+    return _POLA_KATA_BULAN.sub(_ganti_kata_bulan, tgl_str)
+
+
+def ganti_bulan_kolom(values: pd.Series) -> pd.Series:
+    return values.str.replace(_POLA_KATA_BULAN, _ganti_kata_bulan, regex=True)
 
 
 def _angka_bagian(tgl_str: str):
@@ -159,45 +295,248 @@ def _parse_tanggal(tgl_str: str, dayfirst: bool = True) -> tuple[datetime | None
     return None, False
 
 
-def tentukan_kategori_umur(usia):
-    if usia is None:
-        return "TIDAK VALID"
-    if usia < 18:
-        return "ANAK"
-    if usia >= 60:
-        return "LANSIA"
-    return "DEWASA"
+def _infer_format_tanggal(teks: pd.Series) -> list[str]:
+    terisi = teks[teks.ne("")]
+    if terisi.empty:
+        return []
+    langkah = max(len(terisi) // _SAMPEL_FORMAT_TANGGAL, 1)
+    sampel = terisi.iloc[::langkah]
+    return [nama for nama, pola in _POLA_TANGGAL.items() if sampel.str.fullmatch(pola).any()]
+
 
+def _rakit_tanggal(tahun, bulan, hari) -> pd.Series:
+    bagian = pd.DataFrame({"year": tahun, "month": bulan, "day": hari}).astype("float64")
+    return pd.to_datetime(bagian, errors="coerce")
+
+
+def _parse_grup_tanggal(nama: str, teks: pd.Series, dayfirst: bool) -> tuple[pd.Series, pd.Series]:
+    bagian = teks.str.extract(f"^{_POLA_TANGGAL[nama]}$")
+    ambigu = pd.Series(False, index=teks.index)
+
+    if nama == "serial":
+        serial = pd.to_numeric(bagian["serial"], errors="coerce")
+        serial = serial.where((serial > 10000) & (serial < 60000))
+        tanggal = pd.to_datetime(serial, unit="D", origin=pd.Timestamp(1899, 12, 30), errors="coerce")
+    elif nama == "iso":
+        tanggal = _rakit_tanggal(bagian["tahun"], bagian["bulan"], bagian["hari"])
+    elif nama == "nama_bulan":
+        bulan = bagian["bulan"].str.lower().map(_BULAN_ANGKA)
+        tanggal = _rakit_tanggal(bagian["tahun"], bulan, bagian["hari"])
+    else:
+        a = bagian["a"].astype(int)
+        b = bagian["b"].astype(int)
+        ambigu = a.le(12)
+        hari_duluan = ~ambigu | dayfirst
+        tanggal = _rakit_tanggal(bagian["tahun"], b.where(hari_duluan, a), a.where(hari_duluan, b))
 
-def proses_kolom_usia(df_result, col_tgl_lahir, tgl_pengecekan, dayfirst: bool = True):
+    return tanggal, ambigu
+
+
+def parse_kolom_tanggal(values: pd.Series, dayfirst: bool = True) -> tuple[pd.Series, pd.Series]:
+    teks = values.astype(str).fillna("").str.strip()
+    tanggal = np.full(len(teks), None, dtype=object)
+    ambigu = np.zeros(len(teks), dtype=bool)
+    sisa = ~teks.str.lower().isin(["", "nan", "none", "-"]).to_numpy(dtype=bool)
+
+    for nama in _infer_format_tanggal(teks[sisa]):
+        kandidat = sisa & teks.str.fullmatch(_POLA_TANGGAL[nama]).to_numpy(dtype=bool, na_value=False)
+        if not kandidat.any():
+            continue
+        hasil, hasil_ambigu = _parse_grup_tanggal(nama, teks[kandidat], dayfirst)
+        berhasil = hasil.notna().to_numpy()
+        posisi = np.flatnonzero(kandidat)[berhasil]
+        tanggal[posisi] = list(hasil[berhasil].dt.to_pydatetime())
+        ambigu[posisi] = hasil_ambigu.to_numpy(dtype=bool)[berhasil]
+        sisa[posisi] = False
+
+    posisi_sisa = np.flatnonzero(sisa)
+    if len(posisi_sisa):
+        teks_sisa = ganti_bulan_kolom(teks.iloc[posisi_sisa])
+        hasil_sisa = map_unique_values(teks_sisa, lambda x: _parse_tanggal(x, dayfirst=dayfirst))
+        for posisi, (tgl, is_ambigu) in zip(posisi_sisa, hasil_sisa):
+            tanggal[posisi] = tgl
+            ambigu[posisi] = is_ambigu
+
+    return pd.Series(tanggal, index=values.index, dtype=object), pd.Series(ambigu, index=values.index)
+
+
+def kategorikan_usia(usia: pd.Series, batas_kategori=None) -> pd.Series:
+    batas_kategori = batas_kategori or BATAS_KATEGORI_UMUR
+    bins = [batas_bawah for batas_bawah, _ in batas_kategori] + [np.inf]
+    labels = [label for _, label in batas_kategori]
+    kategori = pd.cut(usia, bins=bins, labels=labels, right=False, ordered=False)
+    return kategori.astype(object).where(kategori.notna(), "TIDAK VALID")
+
+
+def _komponen_tanggal(tanggal: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    bulan_ke = tanggal.astype("datetime64[M]")
+    tahun = bulan_ke.astype("datetime64[Y]").astype(np.int64) + 1970
+    bulan = bulan_ke.astype(np.int64) % 12 + 1
+    hari = (tanggal.astype("datetime64[D]") - bulan_ke.astype("datetime64[D]")).astype(np.int64) + 1
+    return tahun, bulan, hari
+
+
+def parse_tanggal_lahir(values: pd.Series, dayfirst: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    tanggal, ambigu = parse_kolom_tanggal(values, dayfirst=dayfirst)
+    return np.array(tanggal.tolist(), dtype="datetime64[us]"), ambigu.to_numpy(dtype=bool)
+
+
+def proses_kolom_usia(
+    df_result, col_tgl_lahir, tgl_pengecekan, dayfirst: bool = True, batas_kategori=None, tanggal_parse=None
+):
     usia_col = f"USIA_{col_tgl_lahir}"
     kategori_col = f"KATEGORI_UMUR_{col_tgl_lahir}"
     parsed_col = f"TGL_PARSED_{col_tgl_lahir}"
     catatan_col = f"CATATAN_PARSE_{col_tgl_lahir}"
 
-    def _parse_row(x):
-        tgl, is_ambigu = _parse_tanggal(str(x), dayfirst=dayfirst)
-        if tgl is None:
-            return None, None, "TIDAK DIKENALI", "Format tidak dikenali"
-        if tgl > tgl_pengecekan:
-            return None, None, "TIDAK DIKENALI", "Tanggal di masa depan"
-        usia = (
-            tgl_pengecekan.year - tgl.year
-            - ((tgl_pengecekan.month, tgl_pengecekan.day) < (tgl.month, tgl.day))
-        )
-        if usia > 130:
-            return None, None, "TIDAK DIKENALI", "Usia > 130 tahun"
-        catatan = "Ambigu (dd/mm atau mm/dd?)" if is_ambigu else "OK"
-        return usia, tentukan_kategori_umur(usia), tgl.strftime("%d/%m/%Y"), catatan
-
-    hasil = df_result[col_tgl_lahir].apply(_parse_row)
-    df_result[usia_col] = hasil.apply(lambda x: x[0])
-    df_result[kategori_col] = hasil.apply(lambda x: x[1] if x[1] else "TIDAK VALID")
-    df_result[parsed_col] = hasil.apply(lambda x: x[2])
-    df_result[catatan_col] = hasil.apply(lambda x: x[3])
+    if tanggal_parse is None:
+        tanggal_parse = parse_tanggal_lahir(df_result[col_tgl_lahir], dayfirst=dayfirst)
+    tanggal, ambigu = tanggal_parse
+    dikenali = ~np.isnat(tanggal)
+    tahun, bulan, hari = _komponen_tanggal(np.where(dikenali, tanggal, np.datetime64(0, "us")))
+
+    masa_depan = dikenali & (tanggal > np.datetime64(tgl_pengecekan, "us"))
+    usia = tgl_pengecekan.year - tahun - ((tgl_pengecekan.month * 100 + tgl_pengecekan.day) < (bulan * 100 + hari))
+    terlalu_tua = dikenali & ~masa_depan & (usia > 130)
+    valid = dikenali & ~masa_depan & ~terlalu_tua
+
+    catatan = np.select(
+        [~dikenali, masa_depan, terlalu_tua, ambigu],
+        ["Format tidak dikenali", "Tanggal di masa depan", "Usia > 130 tahun", "Ambigu (dd/mm atau mm/dd?)"],
+        default="OK",
+    )
+    usia = pd.Series(np.where(valid, usia, np.nan), index=df_result.index)
+    if valid.all():
+        usia = usia.astype(np.int64)
+    tgl_parsed = _teks_angka([(hari, 2), ("/", 1), (bulan, 2), ("/", 1), (tahun, 4)], valid)
+
+    df_result[usia_col] = usia
+    df_result[kategori_col] = kategorikan_usia(usia, batas_kategori).to_numpy(dtype=object)
+    df_result[parsed_col] = np.where(valid, tgl_parsed.to_numpy(), "TIDAK DIKENALI").astype(object)
+    df_result[catatan_col] = catatan.astype(object)
     return df_result, usia_col, kategori_col, parsed_col, catatan_col
 
 
+def _kode_nik(values: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    kode = values.to_numpy(dtype="U17").view(np.uint32).reshape(len(values), 17)
+    digit = kode[:, :16] - ord("0")
+    valid = (kode[:, 16] == 0) & (digit <= 9).all(axis=1)
+    return kode, valid
+
+
+def _gabung_digit(kode: np.ndarray, awal: int, akhir: int) -> np.ndarray:
+    bobot = 10 ** np.arange(akhir - awal - 1, -1, -1, dtype=np.int64)
+    return (kode[:, awal:akhir] - ord("0")) @ bobot
+
+
+def kemas_nik(values: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    kode, valid = _kode_nik(values)
+    packed = np.where(valid, _gabung_digit(kode, 0, 16), 0).astype(np.uint64)
+    return packed, valid
+
+
+def _teks_angka(bagian: list, valid: np.ndarray) -> pd.Series:
+    kode = np.empty((len(valid), sum(lebar for _, lebar in bagian)), dtype=np.uint32)
+    posisi = 0
+    for angka, lebar in bagian:
+        if isinstance(angka, str):
+            kode[:, posisi] = ord(angka)
+        else:
+            angka = np.asarray(angka, dtype=np.int64)
+            for i in range(lebar - 1, -1, -1):
+                kode[:, posisi + i] = angka % 10 + ord("0")
+                angka = angka // 10
+        posisi += lebar
+    teks = kode.view(f"U{kode.shape[1]}").ravel()
+    return pd.Series(np.where(valid, teks, ""), dtype=object)
+
+
+def dekode_nik(values: pd.Series, tgl_pengecekan: datetime, tanggal_lahir: np.ndarray | None = None) -> pd.DataFrame:
+    kode, valid = _kode_nik(values)
+    n = len(valid)
+
+    kode_wilayah = np.where(valid, _gabung_digit(kode, 0, 6), 0)
+    hari = np.where(valid, _gabung_digit(kode, 6, 8), 0)
+    bulan = np.where(valid, _gabung_digit(kode, 8, 10), 0)
+    tahun_2 = np.where(valid, _gabung_digit(kode, 10, 12), 0)
+    nomor_urut = np.where(valid, _gabung_digit(kode, 12, 16), 0)
+
+    perempuan = valid & (hari > 40)
+    hari = np.where(perempuan, hari - 40, hari)
+    tahun = np.where(tahun_2 <= tgl_pengecekan.year % 100, 2000 + tahun_2, 1900 + tahun_2)
+
+    awal_bulan = ((tahun - 1970) * 12 + np.clip(bulan, 1, 12) - 1).astype("datetime64[M]")
+    tanggal = awal_bulan.astype("datetime64[D]") + (np.clip(hari, 1, 31) - 1)
+    tanggal_valid = (
+        valid
+        & (bulan >= 1)
+        & (bulan <= 12)
+        & (hari >= 1)
+        & (hari <= 31)
+        & (tanggal.astype("datetime64[M]") == awal_bulan)
+        & (tanggal <= np.datetime64(tgl_pengecekan.date()))
+    )
+    tanggal = np.where(tanggal_valid, tanggal, np.datetime64("NaT"))
+    provinsi_valid = np.isin(kode_wilayah // 10000, list(KODE_PROVINSI))
+
+    flags = [
+        (~valid, "BUKAN 16 DIGIT ANGKA"),
+        (valid & ~provinsi_valid, "KODE PROVINSI TIDAK DIKENAL"),
+        (valid & ~tanggal_valid, "TANGGAL LAHIR NIK TIDAK VALID"),
+    ]
+    if tanggal_lahir is not None:
+        tanggal_kolom = tanggal_lahir.astype("datetime64[D]")
+        beda = tanggal_valid & ~np.isnat(tanggal_kolom) & (tanggal_kolom != tanggal)
+        flags.append((beda, "TGL LAHIR TIDAK COCOK"))
+
+    kode_catatan = np.zeros(n, dtype=np.int64)
+    for bit, (mask, _) in enumerate(flags):
+        kode_catatan |= mask.astype(np.int64) << bit
+    label_catatan = np.array(
+        ["; ".join(label for bit, (_, label) in enumerate(flags) if kode >> bit & 1) or "OK" for kode in range(2 ** len(flags))],
+        dtype=object,
+    )
+
+    return pd.DataFrame(
+        {
+            "valid": valid,
+            "kode_wilayah": kode_wilayah,
+            "kode_provinsi": kode_wilayah // 10000,
+            "tanggal_lahir": tanggal,
+            "perempuan": perempuan,
+            "nomor_urut": nomor_urut,
+            "catatan": label_catatan[kode_catatan],
+        },
+        index=values.index,
+    )
+
+
+def proses_struktur_nik(df_result, col_name, tgl_pengecekan, tanggal_lahir=None):
+    hasil = dekode_nik(df_result[col_name], tgl_pengecekan, tanggal_lahir)
+    valid = hasil["valid"].to_numpy()
+    tanggal = hasil["tanggal_lahir"]
+    tanggal_valid = tanggal.notna().to_numpy()
+
+    kolom = {
+        f"KODE_WILAYAH_{col_name}": _teks_angka([(hasil["kode_wilayah"], 6)], valid),
+        f"TGL_LAHIR_NIK_{col_name}": _teks_angka(
+            [
+                (tanggal.dt.day.fillna(0), 2), ("/", 1),
+                (tanggal.dt.month.fillna(0), 2), ("/", 1),
+                (tanggal.dt.year.fillna(0), 4),
+            ],
+            tanggal_valid,
+        ),
+        f"JENIS_KELAMIN_NIK_{col_name}": pd.Series(
+            np.where(valid, np.where(hasil["perempuan"], "PEREMPUAN", "LAKI-LAKI"), ""), dtype=object
+        ),
+        f"CATATAN_NIK_{col_name}": hasil["catatan"].reset_index(drop=True),
+    }
+    for output_col, series in kolom.items():
+        df_result[output_col] = series.to_numpy()
+    return df_result, list(kolom.keys())
+
+
 def get_help_text(section: str) -> str:
     return SPLIT_HELP_TEXT.get(section, "")
 
@@ -238,8 +577,9 @@ def auto_detect_birthdate_columns(columns: list) -> list:
 
 
 def build_validation_error_frames(df_result: pd.DataFrame, target_cols: list, usia_result: dict | None = None) -> dict[str, pd.DataFrame]:
+    status_program = [program["status"] for program in PROGRAM_REFERENSI]
     duplicate_frames = []
-    salur_frames = []
+    program_frames = {status: [] for status in status_program}
     empty_frames = []
     invalid_frames = []
 
@@ -254,14 +594,15 @@ def build_validation_error_frames(df_result: pd.DataFrame, target_cols: list, us
         else:
             df_status.insert(0, "ERROR_KOLOM_DICEK", col_name)
         duplicate_mask = df_status[status_col].astype(str).str.startswith("GANDA")
-        salur_mask = df_status[status_col].eq("SUDAH SALUR 2026")
         empty_mask = df_status[status_col].eq("KOSONG")
-        invalid_mask = ~df_status[status_col].isin(["UNIK", "KOSONG", "SUDAH SALUR 2026"]) & ~duplicate_mask
+        invalid_mask = ~df_status[status_col].isin(["UNIK", "KOSONG", *status_program]) & ~duplicate_mask
 
         if duplicate_mask.any():
             duplicate_frames.append(df_status.loc[duplicate_mask])
-        if salur_mask.any():
-            salur_frames.append(df_status.loc[salur_mask])
+        for status in status_program:
+            program_mask = df_status[status_col].eq(status)
+            if program_mask.any():
+                program_frames[status].append(df_status.loc[program_mask])
         if empty_mask.any():
             empty_frames.append(df_status.loc[empty_mask])
         if invalid_mask.any():
@@ -280,14 +621,14 @@ def build_validation_error_frames(df_result: pd.DataFrame, target_cols: list, us
         return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
     duplicate_df = _concat(duplicate_frames)
-    salur_df = _concat(salur_frames)
+    program_dfs = {status: _concat(frames) for status, frames in program_frames.items()}
     empty_df = _concat(empty_frames)
     invalid_df = _concat(invalid_frames)
     usia_invalid_df = _concat(usia_invalid_frames)
     summary_df = pd.DataFrame(
         [
             {"Jenis Error": "DUPLIKAT", "Jumlah Baris": len(duplicate_df)},
-            {"Jenis Error": "SUDAH SALUR 2026", "Jumlah Baris": len(salur_df)},
+            *({"Jenis Error": status, "Jumlah Baris": len(df)} for status, df in program_dfs.items()),
             {"Jenis Error": "KOSONG", "Jumlah Baris": len(empty_df)},
             {"Jenis Error": "TIDAK VALID NIK/NKK", "Jumlah Baris": len(invalid_df)},
             {"Jenis Error": "TANGGAL LAHIR TIDAK VALID", "Jumlah Baris": len(usia_invalid_df)},
@@ -295,7 +636,7 @@ def build_validation_error_frames(df_result: pd.DataFrame, target_cols: list, us
     )
     return {
         "duplicate_df": duplicate_df,
-        "salur_df": salur_df,
+        "program_dfs": program_dfs,
         "empty_df": empty_df,
         "invalid_df": invalid_df,
         "usia_invalid_df": usia_invalid_df,
@@ -318,10 +659,7 @@ def _get_admin_type(tokens: set) -> str:
     return None
 
 
-def _is_similar(val1: str, val2: str) -> bool:
-    tokens1 = _tokenize(val1)
-    tokens2 = _tokenize(val2)
-
+def _is_similar_tokens(tokens1: set, tokens2: set) -> bool:
     type1 = _get_admin_type(tokens1)
     type2 = _get_admin_type(tokens2)
     if type1 and type2 and type1 != type2:
@@ -332,11 +670,21 @@ def _is_similar(val1: str, val2: str) -> bool:
     return bool(non_type_tokens1 & non_type_tokens2)
 
 
+def _build_token_index(tokens_list: list) -> dict:
+    token_index = {}
+    for idx, tokens in enumerate(tokens_list):
+        for token in tokens - set(ADMIN_TYPE_TOKENS.keys()):
+            token_index.setdefault(token, []).append(idx)
+    return token_index
+
+
 def fuzzy_group_values(unique_values: list, frequency_map: dict) -> dict:
     if not unique_values:
         return {}
 
     values_to_check = list(unique_values)
+    tokens_list = map_unique_values(pd.Series(values_to_check, dtype=object), _tokenize).tolist()
+    token_index = _build_token_index(tokens_list)
     clusters = {}
     used = set()
 
@@ -347,10 +695,15 @@ def fuzzy_group_values(unique_values: list, frequency_map: dict) -> dict:
         cluster = [val]
         used.add(val)
 
-        for j, other in enumerate(values_to_check):
+        candidates = set()
+        for token in tokens_list[i] - set(ADMIN_TYPE_TOKENS.keys()):
+            candidates.update(token_index.get(token, ()))
+
+        for j in sorted(candidates):
+            other = values_to_check[j]
             if other in used or i == j:
                 continue
-            if _is_similar(val, other):
+            if _is_similar_tokens(tokens_list[i], tokens_list[j]):
                 cluster.append(other)
                 used.add(other)
 
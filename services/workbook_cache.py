@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+
+WORKBOOK_CACHE_MAX_BYTES = int(os.environ.get("WORKBOOK_CACHE_MAX_MB", "1024")) * 1024 ** 2
+KOLOM_CACHE_MAX_BYTES = int(os.environ.get("KOLOM_CACHE_MAX_MB", "512")) * 1024 ** 2
+UKURAN_POTONGAN_HASH = 1024 ** 2
+HASH_FILE_MAX_ENTRI = 1024
+
+
+def _ukuran(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_ukuran(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_ukuran(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+def _salin(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=True)
+    if isinstance(value, tuple):
+        return tuple(_salin(item) for item in value)
+    if isinstance(value, list):
+        return [_salin(item) for item in value]
+    if isinstance(value, dict):
+        return {kunci: _salin(item) for kunci, item in value.items()}
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+class CacheWorkbook:
+    def __init__(self, max_bytes=WORKBOOK_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entri = OrderedDict()
+        self._hash_file = OrderedDict()
+        self.total_bytes = 0
+        self.jumlah_hit = 0
+        self.jumlah_miss = 0
+
+    def hash_konten(self, uploaded_file):
+        file_id = getattr(uploaded_file, "file_id", None)
+        kunci_file = (file_id, getattr(uploaded_file, "size", None)) if file_id else None
+        with self._lock:
+            if kunci_file in self._hash_file:
+                self._hash_file.move_to_end(kunci_file)
+                return self._hash_file[kunci_file]
+
+        hasher = hashlib.blake2b(digest_size=16)
+        uploaded_file.seek(0)
+        if hasattr(uploaded_file, "getbuffer"):
+            with uploaded_file.getbuffer() as buffer:
+                hasher.update(buffer)
+        else:
+            for potongan in iter(lambda: uploaded_file.read(UKURAN_POTONGAN_HASH), b""):
+                hasher.update(potongan)
+        uploaded_file.seek(0)
+        digest = hasher.hexdigest()
+        if kunci_file:
+            with self._lock:
+                self._hash_file[kunci_file] = digest
+                while len(self._hash_file) > HASH_FILE_MAX_ENTRI:
+                    self._hash_file.popitem(last=False)
+        return digest
+
+    def ambil_atau_muat(self, kunci, muat_fn, pilih=None):
+        pilih = pilih or (lambda value: value)
+        with self._lock:
+            entri = self._entri.get(kunci)
+            if entri is not None:
+                self._entri.move_to_end(kunci)
+                self.jumlah_hit += 1
+            else:
+                self.jumlah_miss += 1
+        if entri is not None:
+            return _salin(pilih(entri[0]))
+
+        value = muat_fn()
+        ukuran = _ukuran(value)
+        with self._lock:
+            if ukuran <= self.max_bytes and kunci not in self._entri:
+                self._entri[kunci] = (value, ukuran)
+                self.total_bytes += ukuran
+                while self.total_bytes > self.max_bytes:
+                    _, (_, ukuran_lama) = self._entri.popitem(last=False)
+                    self.total_bytes -= ukuran_lama
+        return _salin(pilih(value))
+
+    def ringkasan(self):
+        with self._lock:
+            return {
+                "jumlah_entri": len(self._entri),
+                "total_bytes": self.total_bytes,
+                "jumlah_hit": self.jumlah_hit,
+                "jumlah_miss": self.jumlah_miss,
+            }
+
+
+@st.cache_resource
+def cache_workbook():
+    return CacheWorkbook()
+
+
+def hash_file(uploaded_file):
+    return cache_workbook().hash_konten(uploaded_file)
+
+
+def muat_dengan_cache(uploaded_file, jenis, opsi, muat_fn, pilih=None):
+    kunci = (hash_file(uploaded_file), jenis, *opsi)
+    return cache_workbook().ambil_atau_muat(kunci, muat_fn, pilih)
+
+
+@st.cache_resource
+def cache_kolom():
+    return CacheWorkbook(KOLOM_CACHE_MAX_BYTES)
+
+
+def hash_kolom(values):
+    digest = hashlib.blake2b(str(values.dtype).encode("utf-8"), digest_size=16)
+    digest.update(pd.util.hash_pandas_object(values, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def muat_kolom_dengan_cache(values, langkah, opsi, muat_fn):
+    kunci = (langkah, hash_kolom(values), json.dumps(opsi, sort_keys=True, default=str))
+    return cache_kolom().ambil_atau_muat(kunci, muat_fn)
+
+
+def proses_kolom_dengan_cache(df_result, langkah, kolom_input, opsi, proses_fn):
+    kolom_input = list(dict.fromkeys(col for col in kolom_input if col))
+    kunci = (
+        langkah,
+        tuple(kolom_input),
+        tuple(hash_kolom(df_result[col]) for col in kolom_input),
+        json.dumps(opsi, sort_keys=True, default=str),
+    )
+    dihitung = []
+
+    def muat():
+        dihitung.append(True)
+        hasil, ekstra = proses_fn(df_result[kolom_input].copy())
+        tidak_berubah = [col for col in kolom_input if hasil[col].equals(df_result[col])]
+        return hasil.drop(columns=tidak_berubah), ekstra
+
+    potongan, ekstra = cache_kolom().ambil_atau_muat(kunci, muat)
+    for col in potongan.columns:
+        df_result[col] = potongan[col]
+    return df_result, ekstra, not dihitung
@@ -0,0 +1,111 @@
+import re
+import time
+
+import numpy as np
+import pytest
+
+from services.reference_backends import FULL_RESYNC_SECONDS, BackendGoogleSheets, sinkronkan_nik_salur
+from services.validation_logic import buat_indeks_referensi
+
+
+class WorksheetMemori:
+    def __init__(self, nik):
+        self.kolom = {"D": ["NIK", *nik]}
+        self.rentang = []
+
+    def get(self, rentang):
+        self.rentang.append(rentang)
+        kolom, awal, _, akhir = re.fullmatch(r"([A-Z]+)(\d+):([A-Z]+)(\d*)", rentang).groups()
+        values = self.kolom[kolom][int(awal) - 1:int(akhir) if akhir else None]
+        return [[value] if value else [] for value in values]
+
+
+def buat_nik(awal, jumlah):
+    return [f"3201{nomor:012d}" for nomor in range(awal, awal + jumlah)]
+
+
+def daftar_nik(indeks):
+    return {f"{int(nik):016d}" for nik in indeks}
+
+
+@pytest.fixture
+def sinkron_awal():
+    sheet = WorksheetMemori(buat_nik(1, 500))
+    indeks, metadata = sinkronkan_nik_salur(sheet)
+    assert metadata["mode_sinkron"] == "penuh"
+    return sheet, indeks, metadata
+
+
+def test_baris_tambahan_digabung_sebagai_delta(sinkron_awal):
+    sheet, indeks, metadata = sinkron_awal
+    sheet.kolom["D"] += buat_nik(1000, 3)
+
+    indeks_baru, info = sinkronkan_nik_salur(sheet, indeks, metadata)
+
+    assert info["mode_sinkron"] == "delta"
+    assert sheet.rentang == ["D1:D", "D1:D"]
+    assert info["jumlah_baris"] == 504
+    assert info["full_sync_epoch"] == metadata["full_sync_epoch"]
+    assert daftar_nik(indeks_baru) == set(buat_nik(1, 500) + buat_nik(1000, 3))
+
+
+def test_tanpa_perubahan_memakai_indeks_lama(sinkron_awal):
+    sheet, indeks, metadata = sinkron_awal
+
+    indeks_baru, info = sinkronkan_nik_salur(sheet, indeks, metadata)
+
+    assert info["mode_sinkron"] == "delta"
+    assert indeks_baru is indeks
+
+
+@pytest.mark.parametrize("baris", [500, 10])
+def test_suntingan_memicu_sinkron_penuh(sinkron_awal, baris):
+    sheet, indeks, metadata = sinkron_awal
+    nik_lama = sheet.kolom["D"][baris]
+    sheet.kolom["D"][baris] = "3201999999999999"
+
+    indeks_baru, info = sinkronkan_nik_salur(sheet, indeks, metadata)
+
+    assert info["mode_sinkron"] == "penuh"
+    assert nik_lama not in daftar_nik(indeks_baru)
+    assert "3201999999999999" in daftar_nik(indeks_baru)
+
+
+def test_sheet_menyusut_memicu_sinkron_penuh(sinkron_awal):
+    sheet, indeks, metadata = sinkron_awal
+    del sheet.kolom["D"][-50:]
+
+    indeks_baru, info = sinkronkan_nik_salur(sheet, indeks, metadata)
+
+    assert info["mode_sinkron"] == "penuh"
+    assert info["jumlah_baris"] == 451
+    assert daftar_nik(indeks_baru) == set(buat_nik(1, 450))
+
+
+def test_full_sync_epoch_kedaluwarsa_memicu_sinkron_penuh(sinkron_awal):
+    sheet, indeks, metadata = sinkron_awal
+    sheet.kolom["D"] += buat_nik(1000, 3)
+    metadata = {**metadata, "full_sync_epoch": time.time() - FULL_RESYNC_SECONDS - 1}
+
+    indeks_baru, info = sinkronkan_nik_salur(sheet, indeks, metadata)
+
+    assert info["mode_sinkron"] == "penuh"
+    assert info["full_sync_epoch"] > metadata["full_sync_epoch"]
+    assert daftar_nik(indeks_baru) == set(buat_nik(1, 500) + buat_nik(1000, 3))
+
+
+def test_metadata_tanpa_checksum_kolom_memicu_sinkron_penuh(sinkron_awal):
+    sheet, indeks, metadata = sinkron_awal
+    metadata = {key: value for key, value in metadata.items() if key != "checksum_kolom"}
+
+    _, info = sinkronkan_nik_salur(sheet, indeks, metadata)
+
+    assert info["mode_sinkron"] == "penuh"
+
+
+def test_backend_google_sheets_memakai_worksheet_yang_diberikan():
+    sheet = WorksheetMemori(buat_nik(1, 5) + ["", "bukan nik"])
+    indeks, info = BackendGoogleSheets("BNBA", sheet=sheet).muat_indeks()
+
+    assert info["sumber"] == "gsheets:BNBA"
+    np.testing.assert_array_equal(indeks, buat_indeks_referensi(buat_nik(1, 5)))
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from services.reference_registry import RegistriReferensi
+from services.validation_logic import buat_indeks_referensi, hitung_kemunculan, hitung_status_validitas, proses_kolom
+
+
+STATUS_SALUR = "SUDAH SALUR 2026"
+NIK_SALUR = "3201010101010001"
+
+
+def cek_validitas(row, col_name, temp_col, referensi_salur):
+    val = str(row[col_name]).replace(".0", "").strip()
+    count = row[temp_col]
+
+    if not val:
+        return "KOSONG"
+    if len(val) != 16:
+        return "TIDAK 16 DIGIT"
+    if not val.isdigit():
+        return "BUKAN ANGKA"
+    if val.endswith("000"):
+        return "TERKONVERSI (000)"
+    if val in referensi_salur:
+        return STATUS_SALUR
+    if count == 1:
+        return "UNIK"
+    return f"GANDA {count}"
+
+
+def proses_kolom_referensi(df_result, col_name, referensi_salur):
+    df_result[col_name] = df_result[col_name].replace("nan", "").str.strip()
+    temp_col = f"__temp_count_{col_name}"
+    df_result[temp_col] = df_result.groupby(col_name).cumcount() + 1
+    df_result[f"STATUS_{col_name}"] = df_result.apply(
+        lambda row: cek_validitas(row, col_name, temp_col, referensi_salur), axis=1
+    )
+    return df_result.drop(columns=[temp_col])
+
+
+def buat_registri(nik):
+    program = [{"kode": "SALUR", "status": STATUS_SALUR}]
+    return RegistriReferensi.gabungkan(program, [SimpleNamespace(nik=buat_indeks_referensi(nik))])
+
+
+NILAI_UJI = [
+    "",
+    "nan",
+    "   ",
+    "12345",
+    "32010101010100011",
+    "320101010101000A",
+    "32010101010-0001",
+    "3201010101010000",
+    NIK_SALUR,
+    "3201010101010002",
+    "3201010101010003",
+    "3201010101010003",
+    "3201010101010003",
+    "3201010101010004.0",
+    "3201010101010004",
+    " 3201010101010005 ",
+    "3201010101010005",
+    "\t3201010101010006\n",
+    "32010101.010100070",
+]
+
+
+@pytest.mark.parametrize("nilai", [[nilai] for nilai in NILAI_UJI] + [NILAI_UJI])
+def test_hitung_status_validitas_sama_dengan_cek_validitas(nilai):
+    values = pd.Series(nilai, dtype=object)
+    counts = hitung_kemunculan(values)
+    df = pd.DataFrame({"NIK": values, "__count": counts})
+
+    diharapkan = df.apply(lambda row: cek_validitas(row, "NIK", "__count", {NIK_SALUR}), axis=1)
+    hasil = hitung_status_validitas(values, counts, buat_registri([NIK_SALUR]))
+
+    assert hasil.tolist() == diharapkan.tolist()
+
+
+def test_hitung_status_validitas_mencakup_semua_cabang():
+    values = pd.Series(NILAI_UJI, dtype=object)
+    status = set(hitung_status_validitas(values, hitung_kemunculan(values), buat_registri([NIK_SALUR])))
+
+    assert {"KOSONG", "TIDAK 16 DIGIT", "BUKAN ANGKA", "TERKONVERSI (000)", STATUS_SALUR, "UNIK", "GANDA 2", "GANDA 3"} <= status
+
+
+@pytest.mark.parametrize("col_name", ["NIK", "NO KK"])
+def test_proses_kolom_sama_dengan_apply_per_baris(col_name):
+    df = pd.DataFrame({col_name: NILAI_UJI, "NAMA": [f"PM {nomor}" for nomor in range(len(NILAI_UJI))]})
+    referensi = {NIK_SALUR} if col_name == "NIK" else set()
+
+    diharapkan = proses_kolom_referensi(df.copy(), col_name, referensi)
+    hasil = proses_kolom(df.copy(), col_name, False, buat_registri([NIK_SALUR]))
+
+    pd.testing.assert_frame_equal(hasil, diharapkan, check_dtype=False)
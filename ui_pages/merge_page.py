@@ -9,13 +9,16 @@ from services.merge_logic import (
     build_merge_error_frames,
     build_info_process_rows,
     default_column_mapping,
-    get_sheet_names,
+    get_sheet_catalog,
     map_source_to_master,
     mark_duplicates,
     read_workbook_sheet,
     validate_required_columns,
 )
+from services.file_loading import label_sheet
+from services.result_store import ambil_hasil, kunci_hasil, simpan_hasil
 from services.validation_logic import get_help_text
+from services.workbook_cache import hash_file
 
 
 def _file_label(index, uploaded_file):
@@ -31,10 +34,11 @@ def _load_sheet_catalog(uploaded_files):
     for idx, uploaded_file in enumerate(uploaded_files):
         label = _file_label(idx, uploaded_file)
         try:
-            catalog[idx] = {"label": label, "sheets": get_sheet_names(uploaded_file)}
+            info_sheets = {info["nama"]: info for info in get_sheet_catalog(uploaded_file)}
+            catalog[idx] = {"label": label, "sheets": list(info_sheets), "info": info_sheets}
         except Exception as exc:
             st.error(f"Gagal membaca sheet dari {uploaded_file.name}: {exc}")
-            catalog[idx] = {"label": label, "sheets": []}
+            catalog[idx] = {"label": label, "sheets": [], "info": {}}
     return catalog
 
 
@@ -104,6 +108,32 @@ def _render_merge_summary(summary):
             st.dataframe(pd.DataFrame(source_rows), use_container_width=True, hide_index=True)
 
 
+def _simpan_hasil_merge(kunci_store, result):
+    frames = {"df": result["df"], "validation_summary": result["validation_summary"]}
+    frames.update({f"error/{nama}": df for nama, df in result["error_frames"].items()})
+    simpan_hasil(
+        kunci_store,
+        frames=frames,
+        berkas={"buffer": result["buffer"], "error_report_buffer": result["error_report_buffer"]},
+        meta={"summary": result["summary"]},
+    )
+
+
+def _pulihkan_hasil_merge(tersimpan):
+    frames = tersimpan["frames"]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return {
+        "df": frames["df"],
+        "validation_summary": frames["validation_summary"],
+        "summary": tersimpan["meta"]["summary"],
+        "error_frames": {nama.split("/", 1)[1]: df for nama, df in frames.items() if nama.startswith("error/")},
+        "buffer": tersimpan["berkas"]["buffer"],
+        "error_report_buffer": tersimpan["berkas"]["error_report_buffer"],
+        "file_name": f"merge_result_{timestamp}.xlsx",
+        "error_report_file_name": f"merge_error_report_{timestamp}.xlsx",
+    }
+
+
 def render_merge_page():
     st.title("Merge Workbook - Internal Antasena")
     st.caption("Gabungkan beberapa workbook/sheet ke satu sheet berdasarkan struktur kolom tabel master.")
@@ -140,7 +170,12 @@ def render_merge_page():
         master_file_idx = 0
         st.text_input("Workbook master:", value=master_catalog[master_file_idx]["label"], disabled=True)
     with col_master_sheet:
-        master_sheet = st.selectbox("Sheet master:", options=master_catalog[master_file_idx]["sheets"])
+        master_info = master_catalog[master_file_idx]["info"]
+        master_sheet = st.selectbox(
+            "Sheet master:",
+            options=master_catalog[master_file_idx]["sheets"],
+            format_func=lambda nama: label_sheet(master_info[nama]),
+        )
     with col_master_header:
         master_header_row = st.number_input("Header master di baris:", min_value=1, value=1)
 
@@ -199,6 +234,10 @@ def render_merge_page():
     selected_sources = st.multiselect(
         "Sheet yang akan diimport ke tabel master:",
         options=source_options,
+        format_func=lambda label: _source_label(
+            sheet_catalog[source_lookup[label][0]]["label"],
+            label_sheet(sheet_catalog[source_lookup[label][0]]["info"][source_lookup[label][1]]),
+        ),
         placeholder="Pilih satu atau beberapa sheet sumber...",
     )
     if not selected_sources:
@@ -258,103 +297,126 @@ def render_merge_page():
 
     if st.button("PROSES MERGE", use_container_width=True):
         try:
-            progress_bar = st.progress(0)
-            progress_text = st.empty()
-            merged_parts = []
-            master_label = _source_label(sheet_catalog[master_file_idx]["label"], master_sheet)
-            total_steps = len(source_dataframes) + 4
-            current_step = 0
-
-            def update_progress(message):
-                nonlocal current_step
-                current_step += 1
-                progress = min(int(current_step / total_steps * 100), 100)
-                progress_bar.progress(progress)
-                progress_text.text(f"{message} ({progress}%)")
-
-            update_progress("Menyiapkan tabel master")
-            if include_master_rows:
-                if include_source_metadata:
-                    merged_parts.append(add_source_metadata_to_master(master_df, uploaded_files[master_file_idx].name, master_sheet))
+            kunci_store = kunci_hasil(
+                "merge",
+                [hash_file(uploaded_file) for uploaded_file in uploaded_files],
+                {
+                    "nama_file": [uploaded_file.name for uploaded_file in uploaded_files],
+                    "master": [master_sheet, master_header_row, hapus_baris_penomoran_master],
+                    "sources": [[label, *source_lookup[label]] for label in selected_sources],
+                    "source_header_row": source_header_row,
+                    "hapus_baris_penomoran_source": hapus_baris_penomoran_source,
+                    "mappings": source_mappings,
+                    "include_master_rows": include_master_rows,
+                    "include_source_metadata": include_source_metadata,
+                    "required_columns": required_columns,
+                    "duplicate_key_columns": duplicate_key_columns,
+                },
+            )
+            tersimpan = ambil_hasil(kunci_store)
+            if tersimpan:
+                st.session_state.merge_result = _pulihkan_hasil_merge(tersimpan)
+                st.success("Hasil merge diambil dari hasil tersimpan.")
+            else:
+                progress_bar = st.progress(0)
+                progress_text = st.empty()
+                merged_parts = []
+                master_label = _source_label(sheet_catalog[master_file_idx]["label"], master_sheet)
+                total_steps = len(source_dataframes) + 4
+                current_step = 0
+
+                def update_progress(message):
+                    nonlocal current_step
+                    current_step += 1
+                    progress = min(int(current_step / total_steps * 100), 100)
+                    progress_bar.progress(progress)
+                    progress_text.text(f"{message} ({progress}%)")
+
+                update_progress("Menyiapkan tabel master")
+                if include_master_rows:
+                    if include_source_metadata:
+                        merged_parts.append(add_source_metadata_to_master(master_df, uploaded_files[master_file_idx].name, master_sheet))
+                    else:
+                        merged_parts.append(master_df.copy())
+
+                source_row_counts = {}
+                for label, source_df in source_dataframes.items():
+                    update_progress(f"Mapping source: {label}")
+                    file_idx, sheet_name = source_lookup[label]
+                    source_row_counts[label] = len(source_df)
+                    mapped_df = map_source_to_master(
+                        source_df,
+                        master_columns,
+                        source_mappings.get(label, {}),
+                        uploaded_files[file_idx].name,
+                        sheet_name,
+                        include_source_metadata,
+                    )
+                    merged_parts.append(mapped_df)
+
+                update_progress("Menggabungkan seluruh data")
+                merged_df = pd.concat(merged_parts, ignore_index=True) if merged_parts else pd.DataFrame(columns=master_columns)
+                if duplicate_key_columns:
+                    update_progress("Menandai data duplikat")
+                    merged_df = mark_duplicates(merged_df, duplicate_key_columns)
                 else:
-                    merged_parts.append(master_df.copy())
-
-            source_row_counts = {}
-            for label, source_df in source_dataframes.items():
-                update_progress(f"Mapping source: {label}")
-                file_idx, sheet_name = source_lookup[label]
-                source_row_counts[label] = len(source_df)
-                mapped_df = map_source_to_master(
-                    source_df,
-                    master_columns,
-                    source_mappings.get(label, {}),
-                    uploaded_files[file_idx].name,
-                    sheet_name,
-                    include_source_metadata,
+                    update_progress("Melewati deteksi duplikat")
+
+                update_progress("Mengecek kolom wajib")
+                validation_summary = validate_required_columns(merged_df, required_columns)
+                info_rows = build_info_process_rows(
+                    master_label=master_label,
+                    source_labels=selected_sources,
+                    row_count=len(merged_df),
+                    mappings=source_mappings,
+                    validation_summary=validation_summary,
+                    duplicate_key_columns=duplicate_key_columns,
                 )
-                merged_parts.append(mapped_df)
-
-            update_progress("Menggabungkan seluruh data")
-            merged_df = pd.concat(merged_parts, ignore_index=True) if merged_parts else pd.DataFrame(columns=master_columns)
-            if duplicate_key_columns:
-                update_progress("Menandai data duplikat")
-                merged_df = mark_duplicates(merged_df, duplicate_key_columns)
-            else:
-                update_progress("Melewati deteksi duplikat")
-
-            update_progress("Mengecek kolom wajib")
-            validation_summary = validate_required_columns(merged_df, required_columns)
-            info_rows = build_info_process_rows(
-                master_label=master_label,
-                source_labels=selected_sources,
-                row_count=len(merged_df),
-                mappings=source_mappings,
-                validation_summary=validation_summary,
-                duplicate_key_columns=duplicate_key_columns,
-            )
-            merge_summary = _build_merge_summary(
-                master_rows=len(master_df),
-                source_row_counts=source_row_counts,
-                merged_df=merged_df,
-                include_master_rows=include_master_rows,
-                duplicate_key_columns=duplicate_key_columns,
-                validation_summary=validation_summary,
-            )
-            info_rows.extend(
-                [
-                    {"Bagian": "Header Row Master", "Detail": str(master_header_row)},
-                    {"Bagian": "Header Row Source", "Detail": str(source_header_row)},
-                    {"Bagian": "Sertakan Baris Master", "Detail": "Ya" if include_master_rows else "Tidak"},
-                    {"Bagian": "Tambahkan Metadata Source", "Detail": "Ya" if include_source_metadata else "Tidak"},
-                    {"Bagian": "Kolom Wajib", "Detail": ", ".join(required_columns) or "-"},
-                    {"Bagian": "Rekap Baris Master", "Detail": str(merge_summary["master_rows"] if include_master_rows else 0)},
-                    {"Bagian": "Rekap Source Sheet", "Detail": str(merge_summary["source_sheet_count"])},
-                    {"Bagian": "Rekap Baris Source", "Detail": str(merge_summary["source_rows"])},
-                    {"Bagian": "Rekap Baris Hasil", "Detail": str(merge_summary["merged_rows"])},
-                    {"Bagian": "Rekap Baris Duplikat", "Detail": str(merge_summary["duplicate_count"])},
-                    {"Bagian": "Rekap Kosong Kolom Wajib", "Detail": str(merge_summary["required_empty_count"])},
-                ]
-            )
-            for source_label, row_count in source_row_counts.items():
-                info_rows.append({"Bagian": f"Rekap Source Rows {source_label}", "Detail": str(row_count)})
-
-            error_frames = build_merge_error_frames(merged_df, required_columns, duplicate_key_columns)
-            buffer = buat_merge_excel_buffer(merged_df, info_rows)
-            error_report_buffer = buat_merge_error_report_buffer(error_frames)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            progress_bar.progress(100)
-            progress_text.text("Merge selesai (100%)")
-
-            st.session_state.merge_result = {
-                "df": merged_df,
-                "validation_summary": validation_summary,
-                "summary": merge_summary,
-                "error_frames": error_frames,
-                "buffer": buffer.getvalue(),
-                "error_report_buffer": error_report_buffer.getvalue(),
-                "file_name": f"merge_result_{timestamp}.xlsx",
-                "error_report_file_name": f"merge_error_report_{timestamp}.xlsx",
-            }
+                merge_summary = _build_merge_summary(
+                    master_rows=len(master_df),
+                    source_row_counts=source_row_counts,
+                    merged_df=merged_df,
+                    include_master_rows=include_master_rows,
+                    duplicate_key_columns=duplicate_key_columns,
+                    validation_summary=validation_summary,
+                )
+                info_rows.extend(
+                    [
+                        {"Bagian": "Header Row Master", "Detail": str(master_header_row)},
+                        {"Bagian": "Header Row Source", "Detail": str(source_header_row)},
+                        {"Bagian": "Sertakan Baris Master", "Detail": "Ya" if include_master_rows else "Tidak"},
+                        {"Bagian": "Tambahkan Metadata Source", "Detail": "Ya" if include_source_metadata else "Tidak"},
+                        {"Bagian": "Kolom Wajib", "Detail": ", ".join(required_columns) or "-"},
+                        {"Bagian": "Rekap Baris Master", "Detail": str(merge_summary["master_rows"] if include_master_rows else 0)},
+                        {"Bagian": "Rekap Source Sheet", "Detail": str(merge_summary["source_sheet_count"])},
+                        {"Bagian": "Rekap Baris Source", "Detail": str(merge_summary["source_rows"])},
+                        {"Bagian": "Rekap Baris Hasil", "Detail": str(merge_summary["merged_rows"])},
+                        {"Bagian": "Rekap Baris Duplikat", "Detail": str(merge_summary["duplicate_count"])},
+                        {"Bagian": "Rekap Kosong Kolom Wajib", "Detail": str(merge_summary["required_empty_count"])},
+                    ]
+                )
+                for source_label, row_count in source_row_counts.items():
+                    info_rows.append({"Bagian": f"Rekap Source Rows {source_label}", "Detail": str(row_count)})
+
+                error_frames = build_merge_error_frames(merged_df, required_columns, duplicate_key_columns)
+                buffer = buat_merge_excel_buffer(merged_df, info_rows)
+                error_report_buffer = buat_merge_error_report_buffer(error_frames)
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                progress_bar.progress(100)
+                progress_text.text("Merge selesai (100%)")
+
+                result = {
+                    "df": merged_df,
+                    "validation_summary": validation_summary,
+                    "summary": merge_summary,
+                    "error_frames": error_frames,
+                    "buffer": buffer.getvalue(),
+                    "error_report_buffer": error_report_buffer.getvalue(),
+                    "file_name": f"merge_result_{timestamp}.xlsx",
+                    "error_report_file_name": f"merge_error_report_{timestamp}.xlsx",
+                }
+                _simpan_hasil_merge(kunci_store, result)
+                st.session_state.merge_result = result
         except Exception as exc:
             st.error(f"Terjadi kesalahan saat merge: {exc}")
 
@@ -11,9 +11,17 @@ from services.export_helpers import (
     _enforce_text_format_in_memory,
     sanitize_excel_sheet_name,
 )
-from services.file_loading import baca_data_penuh, baca_preview_mentah, siapkan_dataframe, tampilkan_nomor_baris_excel
+from services.file_loading import (
+    baca_data_penuh,
+    baca_katalog_sheet,
+    baca_preview_mentah,
+    label_sheet,
+    tampilkan_nomor_baris_excel,
+)
+from services.result_store import ambil_hasil, kunci_hasil, simpan_hasil
 from services.split_logic import build_output_path, build_sheet_label, build_split_summary, iter_split_groups
 from services.validation_logic import apply_cleaning_to_df, fuzzy_group_values, get_help_text
+from services.workbook_cache import hash_file
 
 
 def render_cluster_controls(items, freq_map, user_winner_picks, suffix=""):
@@ -31,6 +39,29 @@ def render_cluster_controls(items, freq_map, user_winner_picks, suffix=""):
             st.markdown("---")
 
 
+def _render_download_split(output_bytes, jumlah_output, is_multi_sheet_mode, keterangan):
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    st.divider()
+    if is_multi_sheet_mode:
+        st.success(f"Selesai! {jumlah_output} sheet berhasil dibuat ({keterangan})")
+        st.download_button(
+            label="Download Hasil Split (Excel)",
+            data=output_bytes,
+            file_name=f"split_result_{timestamp}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            use_container_width=True,
+        )
+    else:
+        st.success(f"Selesai! {jumlah_output} file berhasil dibuat ({keterangan})")
+        st.download_button(
+            label="Download Hasil Split (ZIP)",
+            data=output_bytes,
+            file_name=f"split_result_{timestamp}.zip",
+            mime="application/zip",
+            use_container_width=True,
+        )
+
+
 def _render_auto_clean_controls(df_full, split_columns, output_count_label):
     enable_auto_clean = st.checkbox(
         "Aktifkan Auto Cleaning (Fuzzy Match)",
@@ -153,8 +184,10 @@ def render_split_page():
 
         with col_file:
             if not is_csv:
-                daftar_sheet = pd.ExcelFile(uploaded_file).sheet_names
-                selected_sheet = st.selectbox("Sheet:", daftar_sheet)
+                katalog_sheet = {info["nama"]: info for info in baca_katalog_sheet(uploaded_file, is_csv)}
+                selected_sheet = st.selectbox(
+                    "Sheet:", list(katalog_sheet), format_func=lambda nama: label_sheet(katalog_sheet[nama])
+                )
             else:
                 selected_sheet = "Sheet1"
                 st.info("File CSV terdeteksi (Hanya 1 Sheet).")
@@ -172,7 +205,7 @@ def render_split_page():
                 help="Otomatis membuang 1 baris tepat di bawah header jika isinya hanya urutan angka kolom.",
             )
 
-        df_full = siapkan_dataframe(baca_data_penuh(uploaded_file, selected_sheet, is_csv, header_row_input), hapus_baris_penomoran)
+        df_full = baca_data_penuh(uploaded_file, selected_sheet, is_csv, header_row_input, hapus_baris_penomoran)
         st.divider()
         st.subheader("2. Pilih Kolom Split Bertingkat")
         cols = df_full.columns.tolist()
@@ -272,6 +305,32 @@ def render_split_page():
             status_text = st.empty()
 
             try:
+                kunci_store = kunci_hasil(
+                    "split",
+                    hash_file(uploaded_file),
+                    {
+                        "nama_file": uploaded_file.name,
+                        "sheet": selected_sheet,
+                        "header_row": header_row_input,
+                        "hapus_baris_penomoran": hapus_baris_penomoran,
+                        "split_columns": split_columns,
+                        "output_mode": output_mode,
+                        "checked_columns": checked_columns,
+                        "clean_target_col": clean_target_col if enable_auto_clean and final_clusters else None,
+                        "final_clusters": final_clusters if enable_auto_clean else {},
+                    },
+                )
+                tersimpan = ambil_hasil(kunci_store)
+                if tersimpan:
+                    progress_bar.progress(100)
+                    _render_download_split(
+                        tersimpan["berkas"]["output"],
+                        tersimpan["meta"]["jumlah_output"],
+                        is_multi_sheet_mode,
+                        "diambil dari hasil tersimpan",
+                    )
+                    return
+
                 if enable_auto_clean and clean_target_col and final_clusters:
                     df_split_data = apply_cleaning_to_df(df_full, clean_target_col, final_clusters)
                 else:
@@ -372,27 +431,10 @@ def render_split_page():
 
                 if not st.session_state.split_state["cancel_requested"]:
                     elapsed = time.time() - st.session_state.split_state["start_time"]
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    st.divider()
-                    if is_multi_sheet_mode:
-                        st.success(f"Selesai! {len(st.session_state.split_state['files_created'])} sheet berhasil dibuat ({elapsed:.1f} detik)")
-                        st.download_button(
-                            label="Download Hasil Split (Excel)",
-                            data=workbook_bytes,
-                            file_name=f"split_result_{timestamp}.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            use_container_width=True,
-                        )
-                    else:
-                        zip_buffer.seek(0)
-                        st.success(f"Selesai! {len(st.session_state.split_state['files_created'])} file berhasil dibuat ({elapsed:.1f} detik)")
-                        st.download_button(
-                            label="Download Hasil Split (ZIP)",
-                            data=zip_buffer.getvalue(),
-                            file_name=f"split_result_{timestamp}.zip",
-                            mime="application/zip",
-                            use_container_width=True,
-                        )
+                    output_bytes = workbook_bytes if is_multi_sheet_mode else zip_buffer.getvalue()
+                    jumlah_output = len(st.session_state.split_state["files_created"])
+                    simpan_hasil(kunci_store, berkas={"output": output_bytes}, meta={"jumlah_output": jumlah_output})
+                    _render_download_split(output_bytes, jumlah_output, is_multi_sheet_mode, f"{elapsed:.1f} detik")
                 else:
                     if not is_multi_sheet_mode:
                         zip_buffer.close()
@@ -1,3 +1,6 @@
+import os
+import tempfile
+import time
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
@@ -5,17 +8,31 @@ import pandas as pd
 import plotly.express as px
 import streamlit as st
 
-from config import COLOR_MAP, COLOR_MAP_KATEGORI, STYLES
+from config import BATAS_KATEGORI_UMUR, COLOR_MAP, COLOR_MAP_KATEGORI, STYLES
 from services.export_helpers import bersihkan_nama_file, buat_excel_buffer, buat_validation_error_report_buffer
-from services.file_loading import baca_data_penuh, baca_preview_mentah, siapkan_dataframe, tampilkan_nomor_baris_excel
+from services.file_loading import (
+    baca_data_penuh,
+    baca_katalog_sheet,
+    baca_preview_mentah,
+    dtype_teks,
+    label_sheet,
+    laporan_memori_teks,
+    tampilkan_nomor_baris_excel,
+)
 from services.logging_utils import catat_log
-from services.reference_data import ambil_data_salur_gspread
+from services.nik_registry import daftarkan_nik, proses_riwayat_pengajuan
+from services.reference_data import ambil_data_salur_gspread, penyedia_referensi_salur
+from services.result_store import ambil_hasil, kunci_hasil, simpan_hasil
+from services.streaming_validation import baca_kolom_csv, validasi_csv_bertahap
+from services.workbook_cache import hash_file, muat_kolom_dengan_cache, proses_kolom_dengan_cache
 from services.validation_logic import (
     auto_detect_birthdate_columns,
     auto_detect_identity_columns,
     build_validation_error_frames,
+    parse_tanggal_lahir,
     proses_kolom,
     proses_kolom_usia,
+    proses_struktur_nik,
 )
 
 
@@ -67,17 +84,14 @@ def render_charts_kategori_umur(df_result, kategori_col, col_tgl_lahir, usia_col
     data_counts.columns = ["Kategori", "Jumlah"]
 
     total = len(df_result)
-    jml_anak = (df_result[kategori_col] == "ANAK").sum()
-    jml_dewasa = (df_result[kategori_col] == "DEWASA").sum()
-    jml_lansia = (df_result[kategori_col] == "LANSIA").sum()
-    jml_invalid = (df_result[kategori_col] == "TIDAK VALID").sum()
+    jumlah_per_kategori = df_result[kategori_col].value_counts()
+    jml_invalid = jumlah_per_kategori.get("TIDAK VALID", 0)
 
-    m1, m2, m3, m4, m5 = st.columns(5)
-    m1.metric("Total Data", total)
-    m2.metric("Anak", jml_anak)
-    m3.metric("Dewasa", jml_dewasa)
-    m4.metric("Lansia", jml_lansia)
-    m5.metric("Tgl Tidak Valid", jml_invalid)
+    kolom_metrik = st.columns(len(BATAS_KATEGORI_UMUR) + 2)
+    kolom_metrik[0].metric("Total Data", total)
+    for kolom, (_, label) in zip(kolom_metrik[1:], BATAS_KATEGORI_UMUR):
+        kolom.metric(label.title(), jumlah_per_kategori.get(label, 0))
+    kolom_metrik[-1].metric("Tgl Tidak Valid", jml_invalid)
 
     st.markdown("---")
     col_pie, col_bar = st.columns(2)
@@ -118,8 +132,15 @@ def render_charts_kategori_umur(df_result, kategori_col, col_tgl_lahir, usia_col
             labels={usia_col: "Usia (Tahun)", "count": "Jumlah"},
             color_discrete_map=COLOR_MAP_KATEGORI,
         )
-        fig_hist.add_vline(x=18, line_dash="dash", line_color="blue", annotation_text="18 th (Dewasa)", annotation_position="top right")
-        fig_hist.add_vline(x=60, line_dash="dash", line_color="red", annotation_text="60 th (Lansia)", annotation_position="top right")
+        for batas_bawah, label in BATAS_KATEGORI_UMUR:
+            if batas_bawah > 0:
+                fig_hist.add_vline(
+                    x=batas_bawah,
+                    line_dash="dash",
+                    line_color=COLOR_MAP_KATEGORI.get(label, "gray"),
+                    annotation_text=f"{batas_bawah} th ({label.title()})",
+                    annotation_position="top right",
+                )
         st.plotly_chart(fig_hist, use_container_width=True)
 
     df_gagal = df_result[df_result[parsed_col] == "TIDAK DIKENALI"]
@@ -172,10 +193,52 @@ def render_filtered_table_usia(df_result, kategori_cols):
     return df_display
 
 
-def render_sidebar(waktu_tarik):
+def _format_aturan_kategori():
+    baris = []
+    for idx, (batas_bawah, label) in enumerate(BATAS_KATEGORI_UMUR):
+        if idx + 1 < len(BATAS_KATEGORI_UMUR):
+            batas_atas = BATAS_KATEGORI_UMUR[idx + 1][0]
+            aturan = f"Usia < {batas_atas} tahun" if batas_bawah <= 0 else f"{batas_bawah} <= Usia < {batas_atas} tahun"
+        else:
+            aturan = f"Usia >= {batas_bawah} tahun"
+        baris.append(f"- **{label}**: {aturan}")
+    return "\n".join(baris)
+
+
+def _format_umur(detik):
+    if detik < 60:
+        return "baru saja"
+    if detik < 3600:
+        return f"{int(detik // 60)} menit lalu"
+    if detik < 86400:
+        return f"{int(detik // 3600)} jam lalu"
+    return f"{int(detik // 86400)} hari lalu"
+
+
+def _format_status_refresh(metrik):
+    if metrik["sedang_refresh"]:
+        return "Sedang memperbarui di latar belakang..."
+    if metrik["galat_terakhir"]:
+        return f"Refresh terakhir gagal: {metrik['galat_terakhir']}"
+    if metrik["refresh_terakhir_epoch"] is None:
+        return "Menunggu pemuatan pertama"
+    return f"Diperiksa {_format_umur(time.time() - metrik['refresh_terakhir_epoch'])}"
+
+
+def render_sidebar(registri_referensi, metrik=None):
     with st.sidebar:
-        st.info(f"Data Salur Terakhir Ditarik:\n\n{waktu_tarik}")
-        st.caption("Sistem mengunci memori selama 1 jam untuk mencegah blokir server Google.")
+        st.info(f"Data Salur Terakhir Ditarik:\n\n{registri_referensi.label}")
+        if registri_referensi.disimpan_epoch:
+            st.caption(f"Umur snapshot: {_format_umur(time.time() - registri_referensi.disimpan_epoch)}")
+        st.caption("Data salur dipakai bersama oleh semua sesi dan diperbarui di latar belakang setiap 1 jam.")
+        if metrik:
+            st.caption(f"Status refresh: {_format_status_refresh(metrik)}")
+            durasi = metrik["durasi_refresh_detik"]
+            st.caption(
+                f"Jumlah NIK: {metrik['jumlah_nik']:,} ({metrik['ukuran_bytes'] / 1024 ** 2:.1f} MB) | "
+                f"Refresh: {metrik['jumlah_refresh']}x, terakhir {durasi if durasi is not None else '-'} detik | "
+                f"Dipakai: {metrik['jumlah_hit']}x"
+            )
 
 
 def _build_validation_info_rows(
@@ -207,31 +270,152 @@ def _build_validation_info_rows(
 def _render_validation_error_tabs(error_frames):
     st.subheader("Pemeriksaan Error")
     duplicate_df = error_frames.get("duplicate_df", pd.DataFrame())
-    salur_df = error_frames.get("salur_df", pd.DataFrame())
+    program_dfs = error_frames.get("program_dfs", {})
     empty_df = error_frames.get("empty_df", pd.DataFrame())
     invalid_df = error_frames.get("invalid_df", pd.DataFrame())
     usia_invalid_df = error_frames.get("usia_invalid_df", pd.DataFrame())
     summary_df = error_frames.get("summary_df", pd.DataFrame())
 
-    tabs = st.tabs(["Duplikat", "Sudah Salur", "Kosong", "Tidak Valid", "Usia Tidak Valid", "Rekap Error"])
     tab_data = [
-        (tabs[0], duplicate_df, "Tidak ada data duplikat."),
-        (tabs[1], salur_df, "Tidak ada data yang sudah salur 2026."),
-        (tabs[2], empty_df, "Tidak ada data kosong."),
-        (tabs[3], invalid_df, "Tidak ada data NIK/NKK tidak valid."),
-        (tabs[4], usia_invalid_df, "Tidak ada tanggal lahir tidak valid."),
+        ("Duplikat", duplicate_df, "Tidak ada data duplikat."),
+        *((status.title(), df, f"Tidak ada data yang {status.lower()}.") for status, df in program_dfs.items()),
+        ("Kosong", empty_df, "Tidak ada data kosong."),
+        ("Tidak Valid", invalid_df, "Tidak ada data NIK/NKK tidak valid."),
+        ("Usia Tidak Valid", usia_invalid_df, "Tidak ada tanggal lahir tidak valid."),
     ]
-    for tab, df_error, empty_message in tab_data:
+    tabs = st.tabs([judul for judul, _, _ in tab_data] + ["Rekap Error"])
+    for tab, (_, df_error, empty_message) in zip(tabs, tab_data):
         with tab:
             if df_error.empty:
                 st.success(empty_message)
             else:
                 st.caption(f"Menampilkan {len(df_error)} baris.")
                 st.dataframe(df_error, use_container_width=True)
-    with tabs[5]:
+    with tabs[-1]:
         st.dataframe(summary_df, use_container_width=True, hide_index=True)
 
-    return any(not frame.empty for frame in [duplicate_df, salur_df, empty_df, invalid_df, usia_invalid_df])
+    return any(not df_error.empty for _, df_error, _ in tab_data)
+
+
+def _pisah_hasil_usia(hasil):
+    return hasil[0], hasil[1:]
+
+
+def _tanggal_lahir(df_result, col_tgl, dayfirst):
+    return muat_kolom_dengan_cache(
+        df_result[col_tgl],
+        "tanggal_lahir",
+        [dayfirst],
+        lambda: parse_tanggal_lahir(df_result[col_tgl], dayfirst=dayfirst),
+    )
+
+
+def _versi_referensi(registri_referensi):
+    return [
+        [program["kode"], indeks.disimpan_epoch, len(indeks.nik)]
+        for program, indeks in zip(registri_referensi.program, registri_referensi.indeks)
+    ]
+
+
+def _simpan_hasil_validasi(kunci_store, hasil):
+    error_frames = hasil["error_frames"]
+    frames = {"df_result": hasil["df_result"]}
+    frames.update({f"error/{nama}": df for nama, df in error_frames.items() if nama != "program_dfs"})
+    frames.update({f"program/{status}": df for status, df in error_frames.get("program_dfs", {}).items()})
+    simpan_hasil(
+        kunci_store,
+        frames=frames,
+        berkas={"excel": hasil["excel_bytes"], "error_report": hasil["error_report_bytes"]},
+        meta={
+            "hasil_usia": hasil["hasil_usia"],
+            "info_rows": hasil["info_rows"],
+            "log_data": hasil["log_data"],
+            "urutan_program": list(error_frames.get("program_dfs", {})),
+        },
+    )
+
+
+def _pulihkan_hasil_validasi(tersimpan):
+    frames, meta = tersimpan["frames"], tersimpan["meta"]
+    error_frames = {nama.split("/", 1)[1]: df for nama, df in frames.items() if nama.startswith("error/")}
+    error_frames["program_dfs"] = {status: frames[f"program/{status}"] for status in meta["urutan_program"]}
+    return {
+        "df_result": frames["df_result"],
+        "hasil_usia": {col: tuple(kolom) for col, kolom in meta["hasil_usia"].items()},
+        "error_frames": error_frames,
+        "info_rows": meta["info_rows"],
+        "log_data": meta["log_data"],
+        "excel_bytes": tersimpan["berkas"]["excel"],
+        "error_report_bytes": tersimpan["berkas"]["error_report"],
+    }
+
+
+def _render_streaming_mode(uploaded_file, registri_referensi):
+    st.subheader("1. Konfigurasi File")
+    header_row_input = st.number_input("Header Table ada di baris ke:", min_value=1, value=1)
+    hapus_baris_penomoran = st.checkbox(
+        "Abaikan baris nomor kolom (1, 2, 3...) Membuang 1 baris di bawah header bila terdapat urutan angka kolom",
+        value=False,
+    )
+    cols = baca_kolom_csv(uploaded_file, header_row_input)
+    if not cols:
+        st.error("Header tidak ditemukan.")
+        return
+
+    st.divider()
+    st.subheader("2. Pilih Kolom Data")
+    detected_identity_cols = auto_detect_identity_columns(cols)
+    target_cols = st.multiselect("Pilih Kolom yang akan dicek (NIK/NKK):", cols, default=detected_identity_cols)
+    use_auto_clean = st.checkbox("Aktifkan Auto-Cleaning", value=False, help="Otomatis menghapus spasi, titik, strip, dan huruf.")
+    cols_tgl_lahir = st.multiselect(
+        "Kolom Tanggal Lahir (opsional):",
+        cols,
+        default=[],
+        help="Kategori umur dihitung dengan tanggal hari ini dan interpretasi dd/mm.",
+    )
+
+    if not st.button("Proses Streaming"):
+        return
+    if not target_cols:
+        st.warning("Silakan pilih minimal 1 kolom NIK/NKK untuk diproses.")
+        return
+
+    fd, output_path = tempfile.mkstemp(prefix="validasi_", suffix=".csv.gz")
+    os.close(fd)
+    try:
+        progress_text = st.empty()
+        with st.spinner("Memproses data per bagian..."):
+            hasil = validasi_csv_bertahap(
+                uploaded_file,
+                output_path,
+                header_row_input,
+                hapus_baris_penomoran,
+                target_cols,
+                use_auto_clean,
+                registri_referensi,
+                cols_tgl_lahir=cols_tgl_lahir,
+                tgl_pengecekan=datetime.now(ZoneInfo("Asia/Jakarta")).replace(tzinfo=None),
+                progress_callback=lambda jumlah: progress_text.text(f"{jumlah:,} baris diproses"),
+            )
+        catat_log(uploaded_file.name, "Sheet1", hasil["rekap_status"])
+
+        st.success(f"Selesai: {hasil['total_baris']:,} baris diproses.")
+        for col_name, rekap in hasil["rekap_status"].items():
+            st.markdown(f"**STATUS_{col_name}**")
+            st.dataframe(pd.DataFrame(list(rekap.items()), columns=["Status", "Jumlah"]), use_container_width=True, hide_index=True)
+        for col_tgl, rekap in hasil["rekap_kategori"].items():
+            st.markdown(f"**KATEGORI_UMUR_{col_tgl}**")
+            st.dataframe(pd.DataFrame(list(rekap.items()), columns=["Kategori", "Jumlah"]), use_container_width=True, hide_index=True)
+
+        with open(output_path, "rb") as output_file:
+            st.download_button(
+                label="Download Hasil Seluruhnya (CSV.GZ)",
+                data=output_file,
+                file_name=f"Result_{bersihkan_nama_file(uploaded_file.name)}.csv.gz",
+                mime="application/gzip",
+            )
+    finally:
+        os.remove(output_path)
 
 
 def render_validasi_page():
@@ -240,13 +424,21 @@ def render_validasi_page():
     st.info("Fitur: Atur Posisi Header, Multi-Kolom, Multi-Sheet, Auto Cleansing, Visualisasi, Auto-Format Text & Kategori Umur.")
 
     if st.button("RESET PROSES VALIDASI", use_container_width=True):
-        for key in ["df_result", "target_cols_saved", "hasil_usia", "validation_error_frames", "validation_info_rows"]:
+        for key in [
+            "df_result",
+            "target_cols_saved",
+            "hasil_usia",
+            "validation_error_frames",
+            "validation_info_rows",
+            "validation_excel_bytes",
+            "validation_error_report_bytes",
+        ]:
             st.session_state.pop(key, None)
         st.session_state.is_processed = False
         st.rerun()
 
-    set_salur_2026, waktu_tarik = ambil_data_salur_gspread()
-    render_sidebar(waktu_tarik)
+    registri_referensi, _ = ambil_data_salur_gspread()
+    render_sidebar(registri_referensi, penyedia_referensi_salur().ringkasan_metrik())
 
     if "is_processed" not in st.session_state:
         st.session_state.is_processed = False
@@ -258,13 +450,25 @@ def render_validasi_page():
 
     try:
         is_csv = uploaded_file.name.endswith(".csv")
-        daftar_sheet = ["Sheet1"] if is_csv else pd.ExcelFile(uploaded_file).sheet_names
+        if is_csv and st.checkbox(
+            "Mode streaming untuk CSV berukuran besar",
+            value=False,
+            help="File dibaca per bagian dan hasil ditulis bertahap ke CSV terkompresi, sehingga DataFrame hasil tidak pernah dibuat utuh. File unggahan dan file hasil untuk diunduh tetap dimuat penuh di memori.",
+        ):
+            _render_streaming_mode(uploaded_file, registri_referensi)
+            st.write("<br><br><br>", unsafe_allow_html=True)
+            return
+
+        katalog_sheet = {info["nama"]: info for info in baca_katalog_sheet(uploaded_file, is_csv)}
+        daftar_sheet = list(katalog_sheet)
 
         st.subheader("1. Konfigurasi File")
         col_sheet, col_header_row = st.columns([2, 1])
         with col_sheet:
             if not is_csv:
-                selected_sheet = st.selectbox("Pilih Sheet:", daftar_sheet)
+                selected_sheet = st.selectbox(
+                    "Pilih Sheet:", daftar_sheet, format_func=lambda nama: label_sheet(katalog_sheet[nama])
+                )
             else:
                 st.info("File CSV terdeteksi (Hanya 1 Sheet).")
                 selected_sheet = daftar_sheet[0]
@@ -282,7 +486,13 @@ def render_validasi_page():
                 help="Otomatis membuang 1 baris tepat di bawah header jika isinya hanya urutan angka kolom.",
             )
 
-        df = siapkan_dataframe(baca_data_penuh(uploaded_file, selected_sheet, is_csv, header_row_input), hapus_baris_penomoran)
+        df = baca_data_penuh(uploaded_file, selected_sheet, is_csv, header_row_input, hapus_baris_penomoran)
+        if dtype_teks() is not object:
+            memori = laporan_memori_teks(uploaded_file, selected_sheet, is_csv)
+            st.caption(
+                f"Memori data: {memori['bytes_per_baris']:,.0f} B/baris ({memori['dtype']}) vs "
+                f"{memori['bytes_per_baris_object']:,.0f} B/baris (object), {memori['rasio']:.0%} dari jalur object."
+            )
 
         st.divider()
         st.subheader("2. Pilih Kolom Data")
@@ -305,6 +515,29 @@ def render_validasi_page():
         if detected_identity_cols:
             st.caption(f"Kolom NIK/NKK terdeteksi otomatis: {', '.join(detected_identity_cols)}")
 
+        dekode_nik_aktif = st.checkbox(
+            "Dekode struktur NIK (kode wilayah, tanggal lahir, jenis kelamin)",
+            value=False,
+            help="Membaca kode wilayah, tanggal lahir (DD+40 untuk perempuan) dan nomor urut dari kolom NIK, "
+            "lalu menandai tanggal mustahil atau kode provinsi yang tidak dikenal.",
+        )
+        cek_riwayat_aktif = st.checkbox(
+            "Cek riwayat pengajuan sebelumnya (registry NIK lokal)",
+            value=False,
+            help="Menandai NIK yang sudah pernah didaftarkan ke registry dari file sebelumnya sebagai PERNAH DIAJUKAN.",
+        )
+        col_tgl_cocok = None
+        if dekode_nik_aktif:
+            opsi_tgl_cocok = ["(tidak dicocokkan)"] + cols
+            deteksi_tgl = auto_detect_birthdate_columns(cols)
+            col_tgl_cocok = st.selectbox(
+                "Cocokkan tanggal lahir NIK dengan kolom:",
+                opsi_tgl_cocok,
+                index=opsi_tgl_cocok.index(deteksi_tgl[0]) if deteksi_tgl else 0,
+            )
+            if col_tgl_cocok == opsi_tgl_cocok[0]:
+                col_tgl_cocok = None
+
         st.divider()
         st.subheader("3. Cek Kategori Umur (Opsional)")
         st.caption(
@@ -312,7 +545,7 @@ def render_validasi_page():
             "isian tanggal lahir, abaikan bagian ini - proses validasi NIK/NKK tetap berjalan seperti biasa."
         )
         aktifkan_cek_umur = st.checkbox(
-            "Aktifkan Pengecekan Kategori Umur (Anak / Dewasa / Lansia)",
+            f"Aktifkan Pengecekan Kategori Umur ({' / '.join(label.title() for _, label in BATAS_KATEGORI_UMUR)})",
             value=False,
             help="Hanya centang jika file Anda memiliki kolom tanggal lahir.",
         )
@@ -356,8 +589,8 @@ def render_validasi_page():
                 )
                 dayfirst = interpretasi_ambigu.startswith("Hari")
                 st.info(
-                    f"**Aturan Kategorisasi:**\n- **ANAK**: Usia < 18 tahun\n- **DEWASA**: 18 <= Usia < 60 tahun\n"
-                    f"- **LANSIA**: Usia >= 60 tahun\n\nTanggal pengecekan: **{tgl_pengecekan_input.strftime('%d/%m/%Y')}** | "
+                    f"**Aturan Kategorisasi:**\n{_format_aturan_kategori()}\n\n"
+                    f"Tanggal pengecekan: **{tgl_pengecekan_input.strftime('%d/%m/%Y')}** | "
                     f"Interpretasi ambigu: **{'dd/mm' if dayfirst else 'mm/dd'}**"
                 )
 
@@ -366,40 +599,129 @@ def render_validasi_page():
                 st.warning("Silakan pilih minimal 1 kolom NIK/NKK untuk diproses.")
             else:
                 with st.spinner("Memproses data..."):
-                    df_result = df.copy()
-                    log_data_all = {}
-                    for col_name in target_cols:
-                        df_result = proses_kolom(df_result, col_name, use_auto_clean, set_salur_2026)
-                        log_data_all[col_name] = df_result[f"STATUS_{col_name}"].value_counts().to_dict()
-
-                    hasil_usia = {}
-                    if aktifkan_cek_umur and cols_tgl_lahir_dipilih:
-                        for col_tgl in cols_tgl_lahir_dipilih:
-                            df_result, usia_col, kategori_col, parsed_col, catatan_col = proses_kolom_usia(
+                    kunci_store = None
+                    if not cek_riwayat_aktif:
+                        kunci_store = kunci_hasil(
+                            "validasi",
+                            hash_file(uploaded_file),
+                            {
+                                "nama_file": uploaded_file.name,
+                                "sheet": selected_sheet,
+                                "header_row": header_row_input,
+                                "hapus_baris_penomoran": hapus_baris_penomoran,
+                                "target_cols": target_cols,
+                                "use_auto_clean": use_auto_clean,
+                                "dekode_nik": dekode_nik_aktif,
+                                "col_tgl_cocok": col_tgl_cocok,
+                                "cols_tgl_lahir": cols_tgl_lahir_dipilih if aktifkan_cek_umur else [],
+                                "tgl_pengecekan": tgl_pengecekan.date().isoformat(),
+                                "dayfirst": dayfirst,
+                                "batas_kategori_umur": BATAS_KATEGORI_UMUR,
+                                "referensi": _versi_referensi(registri_referensi),
+                            },
+                        )
+                    tersimpan = ambil_hasil(kunci_store) if kunci_store else None
+
+                    if tersimpan:
+                        hasil = _pulihkan_hasil_validasi(tersimpan)
+                    else:
+                        df_result = df.copy()
+                        log_data_all = {}
+                        langkah_cache = []
+                        for col_name in target_cols:
+                            registri_kolom = registri_referensi if "NIK" in col_name.upper() else None
+                            df_result, _, dari_cache = proses_kolom_dengan_cache(
                                 df_result,
-                                col_tgl,
-                                tgl_pengecekan,
-                                dayfirst=dayfirst,
+                                "validitas",
+                                [col_name],
+                                [use_auto_clean, _versi_referensi(registri_kolom) if registri_kolom is not None else None],
+                                lambda sub, col_name=col_name: (
+                                    proses_kolom(sub, col_name, use_auto_clean, registri_referensi),
+                                    None,
+                                ),
                             )
-                            hasil_usia[col_tgl] = (usia_col, kategori_col, parsed_col, catatan_col)
-
-                    catat_log(uploaded_file.name, selected_sheet, log_data_all)
-                    error_frames = build_validation_error_frames(df_result, target_cols, hasil_usia)
-                    info_rows = _build_validation_info_rows(
-                        uploaded_file.name,
-                        selected_sheet,
-                        header_row_input,
-                        target_cols,
-                        use_auto_clean,
-                        hasil_usia,
-                        len(df_result),
-                        error_frames,
-                    )
-                    st.session_state.df_result = df_result
+                            langkah_cache.append(dari_cache)
+                            log_data_all[col_name] = df_result[f"STATUS_{col_name}"].value_counts().to_dict()
+                            if dekode_nik_aktif and "NIK" in col_name.upper():
+                                df_result, _, dari_cache = proses_kolom_dengan_cache(
+                                    df_result,
+                                    "struktur_nik",
+                                    [col_name, col_tgl_cocok],
+                                    [tgl_pengecekan.date(), dayfirst if col_tgl_cocok else None, col_tgl_cocok],
+                                    lambda sub, col_name=col_name: proses_struktur_nik(
+                                        sub,
+                                        col_name,
+                                        tgl_pengecekan,
+                                        tanggal_lahir=(
+                                            _tanggal_lahir(df_result, col_tgl_cocok, dayfirst)[0] if col_tgl_cocok else None
+                                        ),
+                                    ),
+                                )
+                                langkah_cache.append(dari_cache)
+                            if cek_riwayat_aktif and "NIK" in col_name.upper():
+                                df_result, riwayat_col, _ = proses_riwayat_pengajuan(df_result, col_name)
+                                log_data_all[riwayat_col] = df_result[riwayat_col].value_counts().to_dict()
+
+                        hasil_usia = {}
+                        if aktifkan_cek_umur and cols_tgl_lahir_dipilih:
+                            for col_tgl in cols_tgl_lahir_dipilih:
+                                df_result, kolom_usia, dari_cache = proses_kolom_dengan_cache(
+                                    df_result,
+                                    "usia",
+                                    [col_tgl],
+                                    [tgl_pengecekan, dayfirst, BATAS_KATEGORI_UMUR],
+                                    lambda sub, col_tgl=col_tgl: _pisah_hasil_usia(
+                                        proses_kolom_usia(
+                                            sub,
+                                            col_tgl,
+                                            tgl_pengecekan,
+                                            dayfirst=dayfirst,
+                                            tanggal_parse=_tanggal_lahir(df_result, col_tgl, dayfirst),
+                                        )
+                                    ),
+                                )
+                                langkah_cache.append(dari_cache)
+                                hasil_usia[col_tgl] = kolom_usia
+
+                        if langkah_cache:
+                            st.caption(
+                                f"{sum(langkah_cache)} dari {len(langkah_cache)} langkah per kolom diambil dari cache, "
+                                f"{len(langkah_cache) - sum(langkah_cache)} dihitung ulang."
+                            )
+
+                        error_frames = build_validation_error_frames(df_result, target_cols, hasil_usia)
+                        info_rows = _build_validation_info_rows(
+                            uploaded_file.name,
+                            selected_sheet,
+                            header_row_input,
+                            target_cols,
+                            use_auto_clean,
+                            hasil_usia,
+                            len(df_result),
+                            error_frames,
+                        )
+                        if dekode_nik_aktif:
+                            info_rows.append({"Bagian": "Dekode Struktur NIK", "Detail": f"Ya (cocokkan dengan: {col_tgl_cocok or '-'})"})
+                        hasil = {
+                            "df_result": df_result,
+                            "hasil_usia": hasil_usia,
+                            "error_frames": error_frames,
+                            "info_rows": info_rows,
+                            "log_data": log_data_all,
+                            "excel_bytes": buat_excel_buffer(df_result, selected_sheet, info_rows).getvalue(),
+                            "error_report_bytes": buat_validation_error_report_buffer(error_frames).getvalue(),
+                        }
+                        if kunci_store:
+                            _simpan_hasil_validasi(kunci_store, hasil)
+
+                    catat_log(uploaded_file.name, selected_sheet, hasil["log_data"])
+                    st.session_state.df_result = hasil["df_result"]
                     st.session_state.target_cols_saved = target_cols
-                    st.session_state.hasil_usia = hasil_usia
-                    st.session_state.validation_error_frames = error_frames
-                    st.session_state.validation_info_rows = info_rows
+                    st.session_state.hasil_usia = hasil["hasil_usia"]
+                    st.session_state.validation_error_frames = hasil["error_frames"]
+                    st.session_state.validation_info_rows = hasil["info_rows"]
+                    st.session_state.validation_excel_bytes = hasil["excel_bytes"]
+                    st.session_state.validation_error_report_bytes = hasil["error_report_bytes"]
                     st.session_state.is_processed = True
 
         if st.session_state.get("is_processed") and st.session_state.get("target_cols_saved") == target_cols:
@@ -434,7 +756,7 @@ def render_validasi_page():
                 has_error_rows = _render_validation_error_tabs(error_frames)
                 if has_error_rows:
                     clean_name = bersihkan_nama_file(uploaded_file.name)
-                    error_buffer = buat_validation_error_report_buffer(error_frames)
+                    error_buffer = st.session_state.get("validation_error_report_bytes") or buat_validation_error_report_buffer(error_frames)
                     st.download_button(
                         label="Download Error Report Validasi (Excel)",
                         data=error_buffer,
@@ -442,8 +764,17 @@ def render_validasi_page():
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                     )
 
+            nik_cols = [col_name for col_name in target_cols if "NIK" in col_name.upper()]
+            if nik_cols:
+                st.divider()
+                if st.button("Daftarkan NIK File Ini ke Registry", help="Simpan NIK valid dari file ini agar terdeteksi pada pengecekan berikutnya."):
+                    jumlah = sum(daftarkan_nik(df_result[col_name], uploaded_file.name, selected_sheet) for col_name in nik_cols)
+                    st.success(f"{jumlah} NIK unik didaftarkan ke registry.")
+
             st.divider()
-            buffer = buat_excel_buffer(df_result, selected_sheet, st.session_state.get("validation_info_rows", []))
+            buffer = st.session_state.get("validation_excel_bytes") or buat_excel_buffer(
+                df_result, selected_sheet, st.session_state.get("validation_info_rows", [])
+            )
             clean_name = bersihkan_nama_file(uploaded_file.name)
             st.download_button(
                 label="Download Hasil Seluruhnya (Excel)",